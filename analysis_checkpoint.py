@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+# Bytes read per step when looking back for the end of the last complete line
+PARTIAL_LINE_SCAN_BYTES = 4096
+
+
+class AnalysisCheckpoint:
+    """Append-only JSONL log of per-frame analysis results.
+
+    Every completed frame is written and flushed as one line, so an
+    interrupted run loses at most the frames that were still in flight.
+    """
+
+    def __init__(self, path, log=None):
+        self.path = Path(path)
+        # Logger (or adapter) of the run owning the checkpoint; the root logger by default
+        self.log = log or logging
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self):
+        """Return {timestamp: record} for frames already in the checkpoint."""
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated final line
+                    self.log.warning(f"Skipping unreadable checkpoint line {line_number} in {self.path}")
+                    continue
+                records[record['timestamp']] = record
+        return records
+
+    def open(self, resume=False):
+        """Open for appending; without resume any previous checkpoint is discarded."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume:
+            self._drop_partial_line()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        return self
+
+    def _drop_partial_line(self):
+        # New records would otherwise be glued onto a line cut short by a crash
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - PARTIAL_LINE_SCAN_BYTES)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b'\n')
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                self.log.warning(f"Dropping a partial last line ({end - position} bytes) from {self.path}")
+                f.truncate(position)
+
+    def append(self, record):
+        """Durably record one frame result."""
+        with self._lock:
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def frames(self):
+        """Checkpointed frames in timestamp order with reused descriptions (or errors) filled in."""
+        records = self.load()
+        frames = [records[t] for t in sorted(records)]
+        for frame in frames:
+            if frame.get('reused_from') is not None:
+                source = records.get(frame['reused_from'])
+                frame['narration'] = source['narration'] if source else None
+                if source and source.get('error'):
+                    frame['error'] = source['error']
+        return frames
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,156 @@
+"""Compact storage for frame analysis results.
+
+Results are written as JSONL: a header line with the run metadata, then
+one compact record per frame in timestamp order. Frames whose description
+was reused from an earlier frame keep only the ``reused_from`` pointer, so
+repeated narrations are stored once. ``iter_frames`` reads the file lazily
+and fills those in, holding only the latest analyzed narration in memory.
+The formatter still keeps every narrated frame while it segments and
+narrates, so its memory use grows with video length.
+
+The older single-document narration_results.json is still readable
+everywhere, and can be converted in either direction:
+
+    python analysis_store.py import narration_results.json narration_results.jsonl
+    python analysis_store.py export narration_results.jsonl narration_results.json
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+FORMAT_NAME = "narration-results"
+FORMAT_VERSION = 1
+RESULTS_FILENAME = "narration_results.jsonl"
+
+
+def compact_record(frame, resolvable=False):
+    """Frame record without empty fields, or a narration the reader can resolve itself."""
+    record = {'timestamp': frame['timestamp']}
+    for key, value in frame.items():
+        if key == 'timestamp' or value is None:
+            continue
+        if resolvable and key in ('narration', 'error'):
+            continue
+        record[key] = value
+    return record
+
+
+def write_results(path, metadata, video_name, frames, analysis_timestamp):
+    """Stream frames (in timestamp order) into a compact results file."""
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    header = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'metadata': metadata,
+        'video_name': video_name,
+        'analysis_timestamp': analysis_timestamp
+    }
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, separators=(',', ':')) + '\n')
+        last_analyzed = None
+        for frame in frames:
+            reused_from = frame.get('reused_from')
+            resolvable = reused_from is not None and reused_from == last_analyzed
+            if reused_from is None:
+                last_analyzed = frame['timestamp']
+            f.write(json.dumps(compact_record(frame, resolvable), separators=(',', ':')) + '\n')
+    os.replace(temp_path, path)
+    return path
+
+
+def is_legacy(path):
+    """True for the original single-document JSON format."""
+    return Path(path).suffix.lower() == '.json'
+
+
+def read_header(path):
+    """Run metadata (metadata, video_name, analysis_timestamp) without reading frames."""
+    if is_legacy(path):
+        data = _load_legacy(path)
+        data.pop('frames', None)
+        return data
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+    if header.get('format') != FORMAT_NAME:
+        raise ValueError(f"Not a narration results file: {path}")
+    return header
+
+
+def iter_frames(path):
+    """Yield frame records in timestamp order, with reused narrations filled in."""
+    if is_legacy(path):
+        yield from _load_legacy(path)['frames']
+        return
+
+    source = None
+    with open(path, 'r', encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            if not line.strip():
+                continue
+            frame = json.loads(line)
+            frame.setdefault('frame_path', None)
+            reused_from = frame.get('reused_from')
+            if reused_from is None:
+                frame.setdefault('narration', None)
+                source = frame
+            else:
+                # Narrations are only omitted when they point at the latest analyzed frame
+                if 'narration' not in frame:
+                    matched = source is not None and source['timestamp'] == reused_from
+                    frame['narration'] = source['narration'] if matched else None
+                    if matched and source.get('error'):
+                        frame['error'] = source['error']
+            yield frame
+
+
+def load_results(path):
+    """Whole results document in the original JSON layout."""
+    data = read_header(path)
+    data.pop('format', None)
+    data.pop('version', None)
+    data['frames'] = list(iter_frames(path))
+    return data
+
+
+def import_json(json_path, output_path):
+    """Convert a legacy narration_results.json to the compact format."""
+    data = _load_legacy(json_path)
+    frames = sorted(data['frames'], key=lambda frame: frame['timestamp'])
+    return write_results(output_path, data.get('metadata'), data.get('video_name'),
+                         frames, data.get('analysis_timestamp'))
+
+
+def export_json(path, output_path):
+    """Write any results file as a legacy narration_results.json."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(load_results(path), f, indent=2)
+    return Path(output_path)
+
+
+def _load_legacy(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert narration results between JSON and compact JSONL.")
+    parser.add_argument('command', choices=['import', 'export'],
+                        help="'import' converts JSON to JSONL, 'export' converts JSONL to JSON")
+    parser.add_argument('source')
+    parser.add_argument('destination')
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        output = import_json(args.source, args.destination)
+    else:
+        output = export_json(args.source, args.destination)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import contextlib
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import openai
+from dotenv import load_dotenv
+
+from progress_events import ProgressBus
+from result_cache import open_cache
+
+# Retry defaults
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def is_retryable(error):
+    """Transient failures worth another attempt: throttling, timeouts, 5xx."""
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def retry_after_seconds(error):
+    """Server-requested delay from retry-after-ms / retry-after headers, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def create_client():
+    """OpenAI client configured from the environment, with the SDK's own retries off."""
+    load_dotenv()
+    if not os.getenv('OPENAI_API_KEY'):
+        raise ValueError("OpenAI API key not found in environment variables")
+    # Retries are handled by RequestController, which also paces them against the quota
+    return openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'), max_retries=0)
+
+
+def job_resources(client=None, request_slots=None, events=None, cache_name=None, cache=None,
+                  cache_dir=None):
+    """(client, request slot guard, progress bus, result cache) for an analyzer or formatter.
+
+    Anything passed in is used as is, so a long-running worker can share one
+    client, cache or cross-process request semaphore across its jobs; the
+    rest are created. There is no cache without a cache_name.
+    """
+    load_dotenv()
+    if cache_name and cache is None:
+        cache = open_cache(cache_name, cache_dir)
+    return (client or create_client(), request_slots or contextlib.nullcontext(),
+            events or ProgressBus(), cache if cache_name else None)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests.
+
+    Each success raises the limit by 1/limit (about +1 per limit's worth of
+    successes); a throttling response halves it, at most once per cooldown so
+    a burst of 429s from the same window counts as one signal.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=16, cooldown=2.0, log=None):
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # Logger (or adapter) of the job using this limit; the root logger by default
+        self.log = log or logging
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+                    self.log.info(f"Throttled: concurrency limit lowered to {int(self.limit)}")
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RequestController:
+    """Shared retry, backoff and concurrency control around API calls.
+
+    Every attempt waits on the rate limiter and an adaptive concurrency slot.
+    Transient errors are retried with exponential backoff and full jitter,
+    never sooner than a server-supplied retry-after. Other errors, and the
+    last transient one once retries run out, are raised to the caller.
+    """
+
+    def __init__(self, rate_limiter=None, concurrency=None, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, metrics=None, log=None):
+        self.rate_limiter = rate_limiter
+        self.log = log or logging
+        self.concurrency = concurrency or AdaptiveConcurrency(log=log)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics = metrics
+
+    def backoff(self, attempt, error):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        requested = retry_after_seconds(error)
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
+
+    def call(self, send, token_estimate=0):
+        """Run send() under rate and concurrency limits, retrying transient failures."""
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                started = time.perf_counter()
+                self.rate_limiter.acquire(token_estimate)
+                self._observe('rate_limit_wait', time.perf_counter() - started)
+            started = time.perf_counter()
+            self.concurrency.acquire()
+            self._observe('concurrency_wait', time.perf_counter() - started)
+
+            throttled = False
+            try:
+                return send()
+            except Exception as e:
+                throttled = isinstance(e, openai.RateLimitError)
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self._increment('failed_requests', error=type(e).__name__)
+                    raise
+                delay = self.backoff(attempt, e)
+                attempt += 1
+                self._increment('retries', error=type(e).__name__)
+                self.log.warning(f"Transient API error ({type(e).__name__}), retry {attempt} of "
+                                f"{self.max_retries} in {delay:.1f}s: {str(e)}")
+            finally:
+                self.concurrency.release(throttled)
+            time.sleep(delay)
+
+    def _observe(self, stage, seconds):
+        if self.metrics:
+            self.metrics.observe(stage, seconds)
+
+    def _increment(self, name, **labels):
+        if self.metrics:
+            self.metrics.increment(name, **labels)
@@ -0,0 +1,225 @@
+"""Headless batch runner: analyze videos and write narrative scripts without a GUI.
+
+Usage:
+    python batch_narrate.py VIDEO_OR_DIR [VIDEO_OR_DIR ...] [options]
+
+One JSON status line is printed to stdout per video, followed by a summary
+line, so the output can be consumed by schedulers and log pipelines.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from narrator_styles import NARRATOR_STYLES, DEFAULT_STYLE
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
+
+# Batch defaults
+DEFAULT_PROCESSES = 2
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+
+def find_videos(paths, recursive=False):
+    """Expand files and directories into a sorted, de-duplicated list of videos."""
+    videos = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            candidates = path.rglob('*') if recursive else path.iterdir()
+            videos.extend(p for p in candidates if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS)
+        elif path.is_file():
+            videos.append(path)
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+    return sorted(set(p.resolve() for p in videos))
+
+
+def process_one(video_path, options, request_slots, shared=None):
+    """Run analysis and narrative formatting for one video in a worker process.
+
+    ``shared`` can hold a ``client``, ``rate_limiter``, ``description_cache``
+    and ``narrative_cache`` reused across jobs by a long-running worker.
+    """
+    # Imported here so the parent process stays light and workers load them once
+    from video_processor import EnhancedVideoAnalyzer
+    from narrative_formatter import NaturalNarrativeFormatter
+    from progress_events import ProgressBus, ConsoleReporter
+    from pipeline_runner import PipelinedRunner
+
+    started = time.time()
+    status = {'video': str(video_path)}
+    events = ProgressBus()
+    reporter = None
+    if options['progress']:
+        reporter = ConsoleReporter(events, prefix=f"[{Path(video_path).name}] ").start()
+    analyzer_options = {
+        'max_workers': options['threads_per_video'],
+        'requests_per_minute': options['requests_per_minute'],
+        'use_cache': options['use_cache'],
+        'sampling': options['sampling'],
+        'resume': options['resume'],
+        'output_root': options['output_root'],
+        'request_slots': request_slots,
+        'batch_size': options['batch_size'],
+        'decode_workers': options['decode_workers'],
+        'two_tier': options['two_tier'],
+        'escalation_policy': options['escalation_policy'],
+        'escalation_threshold': options['escalation_threshold'],
+        'token_budget': options['token_budget']
+    }
+    # Unset adaptive sampling options keep the analyzer's defaults
+    analyzer_options.update((key, options[key]) for key in ('change_threshold', 'min_gap', 'max_gap')
+                            if options[key] is not None)
+    formatter_options = {
+        'request_slots': request_slots,
+        'use_cache': options['use_cache']
+    }
+    if shared:
+        analyzer_options.update(client=shared.get('client'), rate_limiter=shared.get('rate_limiter'),
+                                cache=shared.get('description_cache'))
+        formatter_options.update(client=shared.get('client'), cache=shared.get('narrative_cache'))
+    try:
+        if options['pipelined']:
+            runner = PipelinedRunner(video_path, analyzer_options, formatter_options, events=events,
+                                     styles=options['styles'])
+            status.update(runner.run())
+        else:
+            analyzer = EnhancedVideoAnalyzer(str(video_path), events=events, **analyzer_options)
+            status['analysis'] = analyzer.process_video()
+
+            if not options['skip_narrative']:
+                formatter = NaturalNarrativeFormatter(mode=options['narrative_mode'], events=events,
+                                                      **formatter_options)
+                # Every style is written from one load and segmentation of the analysis
+                narratives = formatter.create_narrative_scripts(status['analysis'], options['styles'])
+                status['narrative'] = narratives[options['styles'][0]]
+                status['narratives'] = narratives
+        status['status'] = 'ok'
+    except Exception as e:
+        status['status'] = 'error'
+        status['error'] = str(e)
+    finally:
+        if reporter:
+            reporter.stop()
+    status['seconds'] = round(time.time() - started, 2)
+    return status
+
+
+def emit(record):
+    print(json.dumps(record), flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze videos and create narration scripts without a GUI.")
+    parser.add_argument('paths', nargs='+', help="Video files or directories containing videos")
+    parser.add_argument('--recursive', action='store_true', help="Search directories recursively")
+    parser.add_argument('--processes', type=int, default=DEFAULT_PROCESSES,
+                        help="Videos processed in parallel")
+    parser.add_argument('--max-concurrent-requests', type=int, default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        help="Global cap on in-flight API requests across all videos")
+    parser.add_argument('--threads-per-video', type=int, default=4,
+                        help="Frame analysis threads within each video")
+    parser.add_argument('--decode-workers', type=int, default=1,
+                        help="Processes decoding each video's frames in parallel time ranges")
+    parser.add_argument('--requests-per-minute', type=int, default=100,
+                        help="Global request quota, split evenly across processes")
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="Consecutive frames sent per vision request")
+    parser.add_argument('--sampling', choices=['fixed', 'adaptive'], default='fixed')
+    parser.add_argument('--change-threshold', type=float, default=None,
+                        help="Adaptive sampling: picture change (0-1, default 0.15) that triggers a new sample")
+    parser.add_argument('--min-gap', type=float, default=None,
+                        help="Adaptive sampling: minimum seconds between samples (default 0.5)")
+    parser.add_argument('--max-gap', type=float, default=None,
+                        help="Adaptive sampling: maximum seconds without a sample (default 5)")
+    parser.add_argument('--two-tier', action='store_true',
+                        help="Cheap low-detail pass first; only interesting frames get the full pass")
+    parser.add_argument('--escalation', dest='escalation_policy', choices=['interest', 'complexity'],
+                        default='interest',
+                        help="Escalate on the first pass's interest rating or on local visual complexity")
+    parser.add_argument('--escalation-threshold', type=float, default=None,
+                        help="Interest (0-10, default 6) or complexity (default 0.02) needed to escalate")
+    parser.add_argument('--token-budget', type=int, default=None,
+                        help="Per-video vision token budget; frames stop escalating once it is spent")
+    parser.add_argument('--output-root', default=None,
+                        help="Directory for <video>_analysis folders (default: current directory)")
+    parser.add_argument('--narrative-mode', choices=['auto', 'single', 'hierarchical', 'scenes'],
+                        default='auto',
+                        help="'scenes' narrates each scene separately so re-runs only regenerate changed scenes; "
+                             "'auto' uses one request for normal-length videos, regenerated on any edit")
+    parser.add_argument('--styles', nargs='+', choices=sorted(NARRATOR_STYLES), default=[DEFAULT_STYLE],
+                        help="Narrator styles to write; several styles share one analysis load and run concurrently")
+    parser.add_argument('--resume', action='store_true', help="Resume from existing checkpoints")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Disable the frame description and narrative caches")
+    parser.add_argument('--skip-narrative', action='store_true', help="Only run frame analysis")
+    parser.add_argument('--pipelined', action='store_true',
+                        help="Narrate scenes while later frames are still being analyzed (scenes mode)")
+    parser.add_argument('--progress', action='store_true',
+                        help="Print each video's latest status to stderr about once a second")
+    return parser.parse_args(argv)
+
+
+def build_options(args, processes=1):
+    """Per-video job options from parsed arguments; the request quota is split across processes."""
+    return {
+        'threads_per_video': args.threads_per_video,
+        'decode_workers': args.decode_workers,
+        'two_tier': args.two_tier,
+        'escalation_policy': args.escalation_policy,
+        'escalation_threshold': args.escalation_threshold,
+        'token_budget': args.token_budget,
+        'requests_per_minute': max(1, args.requests_per_minute // processes),
+        'use_cache': not args.no_cache,
+        'sampling': args.sampling,
+        'change_threshold': args.change_threshold,
+        'min_gap': args.min_gap,
+        'max_gap': args.max_gap,
+        'batch_size': args.batch_size,
+        'resume': args.resume,
+        'output_root': args.output_root,
+        'skip_narrative': args.skip_narrative,
+        'narrative_mode': args.narrative_mode,
+        'styles': list(dict.fromkeys(args.styles)),
+        'progress': args.progress,
+        'pipelined': args.pipelined and not args.skip_narrative
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        videos = find_videos(args.paths, args.recursive)
+    except FileNotFoundError as e:
+        emit({'status': 'error', 'error': str(e)})
+        return 2
+
+    processes = max(1, min(args.processes, len(videos) or 1))
+    options = build_options(args, processes)
+
+    started = time.time()
+    failed = 0
+    with multiprocessing.Manager() as manager:
+        request_slots = manager.BoundedSemaphore(max(1, args.max_concurrent_requests))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(process_one, video, options, request_slots) for video in videos]
+            for future in as_completed(futures):
+                status = future.result()
+                failed += status['status'] != 'ok'
+                emit(status)
+
+    emit({
+        'summary': True,
+        'videos': len(videos),
+        'succeeded': len(videos) - failed,
+        'failed': failed,
+        'seconds': round(time.time() - started, 2)
+    })
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
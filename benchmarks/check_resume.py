@@ -0,0 +1,96 @@
+"""Offline regression check for resuming an interrupted analysis.
+
+Usage:
+    python benchmarks/check_resume.py [--duration 40]
+
+Analyzes a synthetic video against the fake OpenAI server, then cuts the
+checkpoint off after --keep-lines lines plus a partial record, as a crash
+mid-write would. The run is then resumed. Exits non-zero unless the resumed
+results cover exactly the frames of the uninterrupted run and every
+checkpoint line is readable.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_openai_server import serve  # noqa: E402
+from run_benchmark import free_port, wait_for_server  # noqa: E402
+from synthetic_video import generate_video  # noqa: E402
+
+PARTIAL_RECORD = '{"timestamp": 3'
+
+
+def run(args):
+    """Return a failure message, or None if the resumed run lost nothing."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}/v1"
+    server = multiprocessing.Process(target=serve, kwargs={'port': port, 'latency': 0.0,
+                                                           'latency_jitter': 0.0}, daemon=True)
+    server.start()
+    try:
+        wait_for_server(base_url)
+        os.environ['OPENAI_BASE_URL'] = base_url
+        os.environ['OPENAI_API_KEY'] = 'benchmark'
+
+        # Imported after the environment is set so every client targets the fake server
+        from video_processor import EnhancedVideoAnalyzer
+        from analysis_store import iter_frames
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            video_path = generate_video(Path(work_dir) / 'resume.mp4', args.duration, 320, 180, 12)
+
+            def analyze(resume):
+                analyzer = EnhancedVideoAnalyzer(str(video_path), use_cache=False, resume=resume,
+                                                 output_root=work_dir)
+                results_path = analyzer.process_video()
+                return analyzer, [frame['timestamp'] for frame in iter_frames(results_path)]
+
+            analyzer, expected = analyze(resume=False)
+            checkpoint_path = analyzer.output_dir / 'narration_checkpoint.jsonl'
+            lines = checkpoint_path.read_text(encoding='utf-8').splitlines(keepends=True)
+            checkpoint_path.write_text("".join(lines[:args.keep_lines]) + PARTIAL_RECORD, encoding='utf-8')
+
+            _, resumed = analyze(resume=True)
+            unreadable = 0
+            for line in checkpoint_path.read_text(encoding='utf-8').splitlines():
+                try:
+                    json.loads(line)
+                except json.JSONDecodeError:
+                    unreadable += 1
+    finally:
+        server.terminate()
+        server.join()
+
+    missing = sorted(set(expected) - set(resumed))
+    if missing or len(resumed) != len(expected):
+        return f"resumed run has {len(resumed)} of {len(expected)} frames; missing {missing}"
+    if unreadable:
+        return f"checkpoint has {unreadable} unreadable lines after resuming"
+    print(f"ok: {len(resumed)} frames after resuming from {args.keep_lines} lines and a partial record")
+    return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check that resuming from a truncated checkpoint loses no frames.")
+    parser.add_argument('--duration', type=float, default=40, help="Synthetic video length in seconds")
+    parser.add_argument('--keep-lines', type=int, default=15,
+                        help="Complete checkpoint lines kept before the partial record")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    failure = run(parse_args(argv))
+    if failure:
+        print(failure, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
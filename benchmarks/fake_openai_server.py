@@ -0,0 +1,196 @@
+"""Local stand-in for the OpenAI chat-completions endpoint, for offline benchmarks.
+
+Usage:
+    python benchmarks/fake_openai_server.py --port 8765 --latency 0.4 --rate-limit-rate 0.05
+
+Point the tools at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1.
+GET /stats returns request counters as JSON.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOM_WORDS = {
+    'kitchen': "stove oven counter cabinets sink tiles",
+    'living room': "sofa fireplace rug windows bookshelf lamp",
+    'bedroom': "bed pillows closet curtains dresser nightstand",
+    'garden': "trees flowers lawn fence path bench",
+}
+
+
+def fake_description(seed):
+    """Plausible frame description; the seed keeps consecutive frames in one 'room'."""
+    rng = random.Random(seed)
+    room = list(ROOM_WORDS)[seed % len(ROOM_WORDS)]
+    words = ROOM_WORDS[room].split()
+    details = ", ".join(rng.sample(words, 3))
+    return (f"Here's the {room}. You can see the {details}. "
+            f"The light is {rng.choice(['soft', 'bright', 'warm'])} and the space feels "
+            f"{rng.choice(['open', 'cozy', 'calm'])}.")
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/stats'):
+            with self.server.lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        config = self.server.config
+        with self.server.lock:
+            self.server.stats['requests'] += 1
+            self.server.stats['in_flight'] += 1
+            self.server.stats['max_in_flight'] = max(self.server.stats['max_in_flight'],
+                                                     self.server.stats['in_flight'])
+        try:
+            time.sleep(max(0.0, random.gauss(config['latency'], config['latency_jitter'])))
+            roll = random.random()
+            if roll < config['rate_limit_rate']:
+                self._count('rate_limited')
+                self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error'}},
+                                {'retry-after': str(config['retry_after'])})
+            elif roll < config['rate_limit_rate'] + config['error_rate']:
+                self._count('errors')
+                self._send_json(500, {'error': {'message': 'Internal server error', 'type': 'server_error'}})
+            else:
+                self._count('succeeded')
+                completion = self._completion(body)
+                if body.get('stream'):
+                    self._send_stream(completion)
+                else:
+                    self._send_json(200, completion)
+        finally:
+            with self.server.lock:
+                self.server.stats['in_flight'] -= 1
+
+    def _completion(self, body):
+        messages = body.get('messages', [])
+        user_content = messages[-1].get('content', '') if messages else ''
+        system_prompt = messages[0].get('content', '') if messages else ''
+        images = 0
+        image_tokens = 0
+        if isinstance(user_content, list):
+            image_parts = [part for part in user_content if part.get('type') == 'image_url']
+            images = len(image_parts)
+            # Roughly what the real API bills per low/high detail image
+            image_tokens = sum(85 if part['image_url'].get('detail') == 'low' else 765 for part in image_parts)
+            text = " ".join(part.get('text', '') for part in user_content if part.get('type') == 'text')
+        else:
+            text = user_content
+
+        with self.server.lock:
+            seed = self.server.stats['succeeded'] // 8
+        match = re.search(r"receive (\d+) consecutive", text)
+        if images > 1 and match:
+            content = json.dumps([fake_description(seed) for _ in range(images)])
+        elif images and "INTEREST:" in system_prompt:
+            interest = random.Random(self.server.stats['succeeded']).randint(0, 10)
+            content = f"{fake_description(seed).split('. ')[0]}.\nINTEREST: {interest}"
+        elif images:
+            content = fake_description(seed)
+        else:
+            content = "\n\n".join(fake_description(seed + i) for i in range(3))
+
+        prompt_tokens = len(json.dumps(messages)) // 4 if not images else 200 + image_tokens
+        completion_tokens = len(content) // 4
+        return {
+            'id': f"chatcmpl-fake-{seed}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens}
+        }
+
+    def _send_stream(self, completion):
+        """Send a completion as server-sent events, a few words per chunk."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def event(choices, usage=None):
+            chunk = {'id': completion['id'], 'object': 'chat.completion.chunk',
+                     'created': completion['created'], 'model': completion['model'],
+                     'choices': choices, 'usage': usage}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        words = re.findall(r"\S+\s*", completion['choices'][0]['message']['content'])
+        for start in range(0, len(words), 3):
+            event([{'index': 0, 'delta': {'content': "".join(words[start:start + 3])}, 'finish_reason': None}])
+            time.sleep(self.server.config['stream_chunk_delay'])
+        event([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+        event([], completion['usage'])
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _count(self, key):
+        with self.server.lock:
+            self.server.stats[key] += 1
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=8765, latency=0.3, latency_jitter=0.1,
+                error_rate=0.0, rate_limit_rate=0.0, retry_after=1, stream_chunk_delay=0.01):
+    server = ThreadingHTTPServer((host, port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.config = {
+        'latency': latency,
+        'latency_jitter': latency_jitter,
+        'error_rate': error_rate,
+        'rate_limit_rate': rate_limit_rate,
+        'retry_after': retry_after,
+        'stream_chunk_delay': stream_chunk_delay
+    }
+    server.stats = {'requests': 0, 'succeeded': 0, 'errors': 0, 'rate_limited': 0,
+                    'in_flight': 0, 'max_in_flight': 0}
+    return server
+
+
+def serve(**kwargs):
+    make_server(**kwargs).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat-completions server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.3, help="Mean response latency in seconds")
+    parser.add_argument('--latency-jitter', type=float, default=0.1)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+    print(f"Fake OpenAI server on http://{args.host}:{args.port}/v1", flush=True)
+    serve(host=args.host, port=args.port, latency=args.latency, latency_jitter=args.latency_jitter,
+          error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Offline throughput benchmark for the analysis and narrative stages.
+
+Usage:
+    python benchmarks/run_benchmark.py --duration 120 --latency 0.3 --output report.json
+    python benchmarks/run_benchmark.py --baseline report.json --max-regression 0.2
+
+Generates a synthetic video, starts the fake OpenAI server in a separate
+process and runs EnhancedVideoAnalyzer.process_video followed by
+NaturalNarrativeFormatter.create_narrative_script against it. No network
+access or API key is needed. With --baseline, exits non-zero when frames/sec
+drops by more than --max-regression relative to the baseline report.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import socket
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_openai_server import serve  # noqa: E402
+from synthetic_video import generate_video  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(base_url, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            return server_stats(base_url)
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Fake OpenAI server did not start at {base_url}")
+
+
+def server_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=2) as response:
+        return json.load(response)
+
+
+def peak_rss_mb():
+    # ru_maxrss is kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(args):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}/v1"
+    server = multiprocessing.Process(target=serve, kwargs={
+        'port': port,
+        'latency': args.latency,
+        'latency_jitter': args.latency_jitter,
+        'error_rate': args.error_rate,
+        'rate_limit_rate': args.rate_limit_rate
+    }, daemon=True)
+    server.start()
+
+    try:
+        wait_for_server(base_url)
+        os.environ['OPENAI_BASE_URL'] = base_url
+        os.environ['OPENAI_API_KEY'] = 'benchmark'
+
+        # Imported after the environment is set so every client targets the fake server
+        from video_processor import EnhancedVideoAnalyzer
+        from narrative_formatter import NaturalNarrativeFormatter
+        from analysis_store import iter_frames
+        from run_metrics import RunMetrics
+
+        metrics = RunMetrics()
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            stages = {}
+            started = time.perf_counter()
+            video_path = generate_video(Path(work_dir) / 'benchmark.mp4', args.duration,
+                                        args.width, args.height, args.fps)
+            stages['generate_video'] = time.perf_counter() - started
+
+            analyzer = EnhancedVideoAnalyzer(
+                video_path,
+                max_workers=args.max_workers,
+                requests_per_minute=None,
+                use_cache=False,
+                sampling=args.sampling,
+                batch_size=args.batch_size,
+                decode_workers=args.decode_workers,
+                output_root=work_dir,
+                metrics=metrics
+            )
+            started = time.perf_counter()
+            results_path = analyzer.process_video()
+            stages['analysis'] = time.perf_counter() - started
+            analysis_stats = server_stats(base_url)
+
+            frames = sum(1 for _ in iter_frames(results_path))
+
+            formatter = NaturalNarrativeFormatter(metrics=metrics, use_cache=False)
+            started = time.perf_counter()
+            formatter.create_narrative_script(results_path)
+            stages['narrative'] = time.perf_counter() - started
+            final_stats = server_stats(base_url)
+    finally:
+        server.terminate()
+        server.join()
+
+    return {
+        'config': vars(args),
+        'python': platform.python_version(),
+        'frames': frames,
+        'frames_per_second': frames / stages['analysis'] if stages['analysis'] else 0.0,
+        'stage_seconds': {name: round(seconds, 4) for name, seconds in stages.items()},
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'metrics': metrics.summary(),
+        'requests': {
+            'analysis': analysis_stats['requests'],
+            'narrative': final_stats['requests'] - analysis_stats['requests'],
+            'rate_limited': final_stats['rate_limited'],
+            'errors': final_stats['errors'],
+            'max_in_flight': final_stats['max_in_flight']
+        }
+    }
+
+
+def check_regression(report, baseline_path, max_regression):
+    """Return a failure message if throughput fell too far below the baseline."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    floor = baseline['frames_per_second'] * (1 - max_regression)
+    if report['frames_per_second'] < floor:
+        return (f"frames/sec regressed: {report['frames_per_second']:.2f} < {floor:.2f} "
+                f"(baseline {baseline['frames_per_second']:.2f})")
+    return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline narration benchmark.")
+    parser.add_argument('--duration', type=float, default=60, help="Synthetic video length in seconds")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=360)
+    parser.add_argument('--fps', type=int, default=24)
+    parser.add_argument('--latency', type=float, default=0.3, help="Fake API mean latency in seconds")
+    parser.add_argument('--latency-jitter', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--decode-workers', type=int, default=1)
+    parser.add_argument('--sampling', choices=['fixed', 'adaptive'], default='fixed')
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    parser.add_argument('--baseline', help="Compare against a previous JSON report")
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help="Allowed fractional drop in frames/sec versus the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    if args.baseline:
+        failure = check_regression(report, args.baseline, args.max_regression)
+        if failure:
+            print(failure, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Generate synthetic walkthrough-style test videos.
+
+Usage:
+    python benchmarks/synthetic_video.py out.mp4 --duration 120 --width 1920 --height 1080
+
+The clip cycles through flat-coloured "rooms" with a slow pan and a moving
+object, so there are static stretches, gradual motion and hard cuts.
+"""
+import argparse
+
+import numpy as np
+from moviepy import VideoClip
+
+ROOM_COLORS = [(180, 160, 120), (90, 120, 160), (70, 140, 80), (150, 150, 150), (200, 120, 90)]
+
+
+def make_frame_function(width, height, scene_seconds):
+    # Pre-render one textured background per room; frames only shift and annotate it
+    rng = np.random.default_rng(0)
+    backgrounds = []
+    for color in ROOM_COLORS:
+        background = np.empty((height, width * 2, 3), dtype=np.uint8)
+        background[:] = color
+        for _ in range(12):
+            x, y = rng.integers(0, width * 2 - width // 8), rng.integers(0, height - height // 8)
+            w, h = rng.integers(width // 16, width // 6), rng.integers(height // 16, height // 4)
+            background[y:y + h, x:x + w] = rng.integers(0, 255, 3, dtype=np.uint8)
+        backgrounds.append(background)
+
+    def make_frame(t):
+        scene = int(t // scene_seconds)
+        progress = (t % scene_seconds) / scene_seconds
+        background = backgrounds[scene % len(backgrounds)]
+        offset = int(progress * width * 0.5)
+        frame = background[:, offset:offset + width].copy()
+        size = max(4, height // 10)
+        x = int((t * width / 7) % (width - size))
+        y = height // 2
+        frame[y:y + size, x:x + size] = 255
+        return frame
+
+    return make_frame
+
+
+def generate_video(path, duration=60, width=640, height=360, fps=24, scene_seconds=12):
+    """Write a synthetic test video and return its path."""
+    clip = VideoClip(make_frame_function(width, height, scene_seconds), duration=duration).with_fps(fps)
+    clip.write_videofile(str(path), codec='libx264', audio=False, logger=None,
+                         ffmpeg_params=['-g', str(fps * 10)])
+    clip.close()
+    return str(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic test video.")
+    parser.add_argument('output')
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=360)
+    parser.add_argument('--fps', type=int, default=24)
+    parser.add_argument('--scene-seconds', type=float, default=12)
+    args = parser.parse_args()
+    print(generate_video(args.output, args.duration, args.width, args.height, args.fps, args.scene_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import numpy as np
+
+# ITU-R BT.601 luma weights
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def to_grayscale(frame):
+    """Convert an HxWx3 RGB frame (or HxW gray frame) to float32 luma."""
+    if frame.ndim == 2:
+        return frame.astype(np.float32)
+    return frame[..., :3].astype(np.float32) @ LUMA_WEIGHTS
+
+
+def block_mean(image, rows, cols):
+    """Area-downscale a 2-D array to rows x cols using block averages."""
+    height, width = image.shape
+    row_edges = np.linspace(0, height, rows + 1).astype(int)
+    col_edges = np.linspace(0, width, cols + 1).astype(int)
+    sums = np.add.reduceat(np.add.reduceat(image, row_edges[:-1], axis=0), col_edges[:-1], axis=1)
+    counts = np.outer(np.diff(row_edges), np.diff(col_edges))
+    return sums / np.maximum(counts, 1)
+
+
+def frame_signature(frame, hash_size=8):
+    """Compute a difference hash (dHash) of a frame as a flat boolean array.
+
+    The frame is reduced to a hash_size x (hash_size + 1) luma thumbnail and
+    each bit records whether a cell is brighter than its left neighbour, so
+    the signature survives compression noise and small exposure shifts.
+    """
+    small = block_mean(to_grayscale(frame), hash_size, hash_size + 1)
+    return (small[:, 1:] > small[:, :-1]).ravel()
+
+
+def hamming_distance(signature_a, signature_b):
+    """Number of differing bits between two signatures."""
+    return int(np.count_nonzero(signature_a != signature_b))
+
+
+def change_features(frame, bins=32, grid=8):
+    """Cheap per-frame features used to score visual change."""
+    gray = to_grayscale(frame)
+    histogram, _ = np.histogram(gray, bins=bins, range=(0, 256))
+    return histogram / max(histogram.sum(), 1), block_mean(gray, grid, grid) / 255.0
+
+
+def change_score(features_a, features_b):
+    """Visual change between two frames in [0, 1].
+
+    Takes the larger of the histogram distance (global lighting/colour shift,
+    e.g. a cut) and the mean block difference (layout shift, e.g. a pan).
+    """
+    histogram_a, blocks_a = features_a
+    histogram_b, blocks_b = features_b
+    histogram_distance = 0.5 * np.abs(histogram_a - histogram_b).sum()
+    block_distance = np.abs(blocks_a - blocks_b).mean()
+    return float(max(histogram_distance, block_distance))
+
+
+def visual_complexity(frame, grid=64):
+    """How much detail a frame shows, as mean absolute luma gradient of a thumbnail.
+
+    Scaled to [0, 1]; blank walls and doorways score near 0 while cluttered,
+    textured scenes score higher.
+    """
+    small = block_mean(to_grayscale(frame), grid, grid) / 255.0
+    return float((np.abs(np.diff(small, axis=0)).mean() + np.abs(np.diff(small, axis=1)).mean()) / 2)
+
+
+def signature_to_hex(signature):
+    """Pack a boolean signature into a hex string for JSON storage."""
+    return np.packbits(signature).tobytes().hex()
+
+
+def signature_from_hex(value, bits=64):
+    """Unpack a hex signature back into a flat boolean array."""
+    return np.unpackbits(np.frombuffer(bytes.fromhex(value), dtype=np.uint8))[:bits].astype(bool)
@@ -0,0 +1,146 @@
+import io
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from moviepy import VideoFileClip
+from PIL import Image
+
+from frame_features import change_features, change_score, frame_signature
+
+# Adaptive sampling defaults
+DEFAULT_SCAN_FPS = 4
+DEFAULT_SCAN_WIDTH = 160
+DEFAULT_CHANGE_THRESHOLD = 0.15
+DEFAULT_MIN_GAP = 0.5
+DEFAULT_MAX_GAP = 5.0
+
+# Parallel decoding: sampled frames per worker task
+DEFAULT_SEGMENT_FRAMES = 32
+
+
+def fixed_frame_times(duration, interval=1):
+    """Uniform timestamps every `interval` seconds, including a final partial interval."""
+    count = math.ceil(duration / interval)
+    if interval == int(interval):
+        return [i * int(interval) for i in range(count)]
+    return [round(i * interval, 3) for i in range(count)]
+
+
+def adaptive_frame_times(video_path, scan_fps=DEFAULT_SCAN_FPS, scan_width=DEFAULT_SCAN_WIDTH,
+                         change_threshold=DEFAULT_CHANGE_THRESHOLD, min_gap=DEFAULT_MIN_GAP,
+                         max_gap=DEFAULT_MAX_GAP):
+    """Pick analysis timestamps where the picture changes.
+
+    Runs a cheap low-resolution decode at `scan_fps` and emits a timestamp
+    whenever the change score against the last emitted frame reaches
+    `change_threshold` (at most once per `min_gap` seconds), or when
+    `max_gap` seconds pass without one. Static footage gets sparse samples
+    while quick cuts are caught between whole seconds.
+    """
+    frame_times = []
+    last_time = None
+    last_features = None
+    with VideoFileClip(video_path, audio=False, target_resolution=(scan_width, None)) as clip:
+        for t, frame in clip.iter_frames(fps=scan_fps, with_times=True, dtype='uint8'):
+            features = change_features(frame)
+            if last_time is not None:
+                gap = t - last_time
+                if gap < min_gap:
+                    continue
+                if gap < max_gap and change_score(features, last_features) < change_threshold:
+                    continue
+            frame_times.append(round(float(t), 3))
+            last_time = t
+            last_features = features
+    return frame_times
+
+
+def iter_sampled_frames(video, frame_times, first_frame=0):
+    """Decode a clip once, in order, yielding (timestamp, frame) for sampled times.
+
+    Random access through ``video.get_frame(t)`` can re-seek and decode from the
+    nearest keyframe on long-GOP files. Walking every frame sequentially lets
+    ffmpeg stream the file while only the requested timestamps are passed on,
+    so at most one decoded frame is held at a time. ``first_frame`` is the
+    source frame number the clip starts at, when it is a subclip.
+    """
+    fps = video.fps
+    targets = iter(sorted(frame_times))
+    target = next(targets, None)
+    if target is None:
+        return
+
+    frames = video.iter_frames(with_times=True, dtype='uint8')
+    for index, (_, frame) in enumerate(frames, first_frame):
+        # Same frame-number rule as moviepy's reader so results match get_frame(t)
+        while target is not None and int(fps * target + 0.00001) <= index:
+            yield target, frame
+            target = next(targets, None)
+        if target is None:
+            return
+
+
+def encode_frame(frame, max_dimension=None, quality=85):
+    """Encode an RGB frame to JPEG bytes in memory, downscaling if needed.
+
+    The longest side is capped at ``max_dimension`` (None keeps the source
+    resolution) so the upload matches what the vision model actually uses.
+    """
+    image = Image.fromarray(frame)
+    if max_dimension and max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def shrink_encoded_frame(image_bytes, max_dimension, quality=85):
+    """Downscale JPEG bytes; returns (jpeg_bytes, rgb_array) of the smaller image."""
+    image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+    if max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue(), np.asarray(image)
+
+
+def decode_segment(video_path, frame_times, max_dimension=None, quality=85):
+    """Decode, hash and encode one run of sampled timestamps with its own clip handle.
+
+    The clip is cut at the frame boundary of the first timestamp, so frame
+    numbering (and therefore which frame each timestamp maps to) matches a
+    full sequential decode. Returns [(timestamp, signature, jpeg_bytes), ...].
+    """
+    results = []
+    with VideoFileClip(video_path, audio=False) as clip:
+        first_frame = int(clip.fps * frame_times[0] + 0.00001)
+        video = clip.subclipped(first_frame / clip.fps) if first_frame else clip
+        for t, frame in iter_sampled_frames(video, frame_times, first_frame):
+            results.append((t, frame_signature(frame), encode_frame(frame, max_dimension, quality)))
+    return results
+
+
+def iter_parallel_frames(video_path, frame_times, workers, max_dimension=None, quality=85,
+                         segment_frames=DEFAULT_SEGMENT_FRAMES):
+    """Yield (timestamp, signature, jpeg_bytes) in order, decoded across a process pool.
+
+    Timestamps are split into runs of ``segment_frames``; each run is
+    decoded in a worker process and results are passed on in timestamp
+    order as soon as each run is ready. At most ``2 * workers`` runs are
+    queued or held, so memory stays bounded on long videos.
+    """
+    frame_times = sorted(frame_times)
+    segments = [frame_times[i:i + segment_frames] for i in range(0, len(frame_times), segment_frames)]
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = []
+        next_segment = 0
+        while next_segment < len(segments) or pending:
+            while next_segment < len(segments) and len(pending) < 2 * workers:
+                pending.append(executor.submit(decode_segment, video_path, segments[next_segment],
+                                               max_dimension, quality))
+                next_segment += 1
+            yield from pending.pop(0).result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,14 +1,47 @@
-import json
 import os
+import time
+import logging
+import threading
 from pathlib import Path
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-from openai import OpenAI
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from run_metrics import RunMetrics
+from progress_events import ProgressBus, run_in_background
+from api_requests import RequestController, AdaptiveConcurrency, job_resources
+from analysis_store import read_header, iter_frames
+from result_cache import make_cache_key, NARRATIVE_CACHE
+from prompt_compaction import (compact_scene, compact_scenes, count_tokens,
+                               DEFAULT_SCENE_TOKEN_BUDGET, DEFAULT_TOTAL_TOKEN_BUDGET)
+from scene_segmentation import segment_scenes, DEFAULT_MIN_SCENE_SECONDS
+from narrator_styles import get_style, DEFAULT_STYLE
+
+NARRATIVE_MODEL = "gpt-4-turbo-preview"
+STITCH_PROMPT = """You are editing a spoken video tour that was written in separate parts.
+Rewrite the opening paragraph so it follows naturally from the end of the previous part:
+no fresh greeting, no repeated introductions, a simple transition if the location changed.
+Keep the same plain, conversational voice, the same facts and any timestamps.
+Reply with only the rewritten paragraph."""
+CONTINUE_PROMPT = "Continue the tour from exactly where you stopped. Don't repeat anything you already said."
+SCENE_SEPARATOR = "\n\n=== Location Change ===\n\n"
+
+# Last line of the script header; everything after it is narrative text
+HEADER_END = "=====================================================\n\n"
+# Status update frequency while streaming, in received chunks
+STREAM_STATUS_INTERVAL = 50
+
+# Hierarchical narrative defaults
+DEFAULT_CHUNK_CHARS = 12000
+DEFAULT_MAX_CONCURRENT_CHUNKS = 4
+CHUNK_MAX_TOKENS = 1500
+STITCH_MAX_TOKENS = 400
+CARRY_OVER_CHARS = 300
 
 class ProgressWindow:
     def __init__(self, title="Creating Narrative"):
+        # Imported here so headless runs work on Python builds without Tk
+        import tkinter as tk
+        from tkinter import ttk
+
         self.root = tk.Tk()
         self.root.title(title)
         
@@ -40,28 +73,55 @@ class ProgressWindow:
         self.root.destroy()
 
 class NaturalNarrativeFormatter:
-    def __init__(self, progress_window):
+    def __init__(self, progress_window=None, request_slots=None, mode="auto",
+                 chunk_chars=DEFAULT_CHUNK_CHARS, max_concurrent_chunks=DEFAULT_MAX_CONCURRENT_CHUNKS,
+                 min_scene_seconds=DEFAULT_MIN_SCENE_SECONDS, metrics=None, stream=False, resume=False,
+                 compact=True, scene_token_budget=DEFAULT_SCENE_TOKEN_BUDGET,
+                 total_token_budget=DEFAULT_TOTAL_TOKEN_BUDGET, use_cache=True, cache_dir=None,
+                 events=None, client=None, style=DEFAULT_STYLE, cache=None):
         self.progress = progress_window
-        load_dotenv()
-        
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        if not os.getenv('OPENAI_API_KEY'):
-            raise ValueError("OpenAI API key not found in environment variables")
+        self.client, self.request_slots, self.events, self.cache = job_resources(
+            client, request_slots, events, NARRATIVE_CACHE if use_cache else None, cache, cache_dir
+        )
+        # Default narrator style; create_narrative_scripts() can write several at once
+        self.style = get_style(style)
+        if mode not in ("auto", "single", "hierarchical", "scenes"):
+            raise ValueError(f"Unknown narrative mode: {mode}")
+        self.mode = mode
+        self.chunk_chars = chunk_chars
+        self.max_concurrent_chunks = max(1, max_concurrent_chunks)
+        self.min_scene_seconds = min_scene_seconds
+        self.metrics = metrics or RunMetrics()
+        self.stream = stream
+        self.resume = resume
+        self.compact = compact
+        self.scene_token_budget = scene_token_budget
+        self.total_token_budget = total_token_budget
+        self._compacted = {}
+        self.requests = RequestController(
+            concurrency=AdaptiveConcurrency(initial_limit=self.max_concurrent_chunks,
+                                            max_limit=self.max_concurrent_chunks),
+            metrics=self.metrics
+        )
 
-        self.script_header = """NARRATION SCRIPT
-{title}
-Duration: {duration}
-Generated: {date}
+    @property
+    def script_header(self):
+        return self.style.header
 
-Narrator: Veteran Tour Guide
-- Natural, conversational style
-- Clear and direct descriptions
-- Simple location transitions
-- Practical observations
+    def resolve_style(self, style=None):
+        """The given style (or style name), defaulting to the formatter's own."""
+        return self.style if style is None else get_style(style)
 
-=====================================================
+    def update_status(self, message, **fields):
+        """Publish a progress event; a directly attached window is updated in place.
 
-"""
+        Tk is not thread-safe, so from worker threads the message only goes
+        to the event bus (a TkProgressPump relays it to a window).
+        """
+        self.events.publish(message, **fields)
+        if self.progress and threading.current_thread() is threading.main_thread():
+            self.progress.update_status(message)
+        logging.info(message)
 
     def format_time(self, seconds):
         minutes = int(seconds) // 60
@@ -69,135 +129,399 @@ Narrator: Veteran Tour Guide
         return f"{minutes:02d}:{remaining_seconds:02d}"
 
     def identify_scene_changes(self, frames):
-        """Group frames by major scene changes"""
-        self.progress.update_status("Identifying scene changes...")
-        scenes = []
-        current_scene = []
-        
-        for i, frame in enumerate(frames):
-            # Start a new scene if this is a transition frame
-            description = frame['narration'].lower()
-            is_transition = any(term in description for term in [
-                'moving to', 'entering', 'stepping into', 'next we have',
-                'moving into', 'heading to', 'walking into', 'now in'
-            ])
-            
-            if is_transition and current_scene:
-                scenes.append(current_scene)
-                current_scene = [frame]
-            else:
-                current_scene.append(frame)
-                
-            # Handle last frame
-            if i == len(frames) - 1 and current_scene:
-                scenes.append(current_scene)
-                
-        if not scenes and current_scene:
-            scenes.append(current_scene)
-            
-        return scenes
+        """Group frames by major scene changes
+
+        Segmentation and the narrative prompts need every narrated frame, so
+        memory here grows with the video's length even when frames are read
+        lazily. pipeline_runner.py segments frames as they arrive instead.
+        """
+        self.update_status("Identifying scene changes...")
+        # Frames whose analysis failed have nothing to narrate; keep only the fields used from here on
+        frames = [{'timestamp': frame['timestamp'], 'narration': frame['narration'],
+                   'signature': frame.get('signature')}
+                  for frame in frames if frame.get('narration')]
+        with self.metrics.timer('scene_segmentation'):
+            # Compacted texts from an earlier analysis won't be asked for again
+            self._compacted = {}
+            return segment_scenes(frames, min_scene_seconds=self.min_scene_seconds)
+
+    def scene_key(self, scene):
+        """Content key for a scene's compacted text: its frames' timestamps and narrations."""
+        return make_cache_key(*(part for frame in scene
+                                for part in (repr(frame['timestamp']), frame['narration'])))
+
+    def scene_text(self, scene):
+        """Description text for one scene, compacted to its token budget if enabled."""
+        if not self.compact:
+            return "\n".join(frame['narration'] for frame in scene)
+        key = self.scene_key(scene)
+        if key not in self._compacted:
+            self._compacted[key] = compact_scene(scene, self.format_time, self.scene_token_budget)
+        return self._compacted[key]
+
+    def forget_scene(self, scene):
+        """Drop a scene's compacted text once no more requests need it."""
+        self._compacted.pop(self.scene_key(scene), None)
 
-    def create_natural_narrative(self, grouped_scenes):
-        """Create a natural, conversational narrative"""
+    def scene_context(self, scene, text=None):
+        """Format one scene's frame descriptions for a narrative prompt."""
+        scene_start = self.format_time(scene[0]['timestamp'])
+        return f"Location starting at [{scene_start}]:\n" + (text if text is not None else self.scene_text(scene))
+
+    def budgeted_contexts(self, grouped_scenes):
+        """Scene contexts for a single request, shrunk to fit the overall token budget."""
+        contexts = [self.scene_context(scene) for scene in grouped_scenes]
+        if not (self.compact and self.total_token_budget):
+            return contexts
+        if sum(count_tokens(context) for context in contexts) <= self.total_token_budget:
+            return contexts
+        texts = compact_scenes(grouped_scenes, self.format_time, self.scene_token_budget,
+                               self.total_token_budget)
+        return [self.scene_context(scene, text) for scene, text in zip(grouped_scenes, texts)]
+
+    def cached_narrative(self, system_prompt, user_content, max_tokens):
+        """Cache key and any cached text for a narrative request.
+
+        Keys cover the model, prompt, request content and token limit, so a
+        changed scene or prompt only misses for the requests it feeds.
+        """
+        if not self.cache:
+            return None, None
+        key = make_cache_key(NARRATIVE_MODEL, system_prompt, user_content, str(max_tokens))
+        cached = self.cache.get(key)
+        self.metrics.increment('cache_hits' if cached is not None else 'cache_misses')
+        return key, cached
+
+    def request_narrative(self, system_prompt, user_content, max_tokens=4000):
+        """Send one narrative request and return the generated text."""
+        cache_key, cached = self.cached_narrative(system_prompt, user_content, max_tokens)
+        if cached is not None:
+            return cached
+
+        def send():
+            with self.request_slots:
+                with self.metrics.timer('narrative_request'):
+                    return self.client.chat.completions.create(
+                        model=NARRATIVE_MODEL,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_content}
+                        ],
+                        temperature=0.7,
+                        max_tokens=max_tokens
+                    )
+
+        response = self.requests.call(send)
+        self.metrics.increment('requests', endpoint='narrative')
+        self.metrics.record_usage(response, NARRATIVE_MODEL)
+        text = response.choices[0].message.content
+        if cache_key and text:
+            self.cache.put(cache_key, text)
+        return text
+
+    def stream_narrative(self, system_prompt, user_content, on_text, max_tokens=4000, partial=None):
+        """Send one streamed narrative request, passing text to on_text as it arrives.
+
+        With `partial`, the model is shown the text already written and asked
+        to carry on from there, so an interrupted script can be resumed.
+        A stream is only retried if it fails before any text was passed on.
+        """
+        cache_key = None
+        if not partial:
+            cache_key, cached = self.cached_narrative(system_prompt, user_content, max_tokens)
+            if cached is not None:
+                on_text(cached)
+                return cached
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ]
+        if partial:
+            messages += [
+                {"role": "assistant", "content": partial},
+                {"role": "user", "content": CONTINUE_PROMPT}
+            ]
+
+        def send():
+            pieces = []
+            with self.request_slots:
+                started = time.perf_counter()
+                try:
+                    stream = self.client.chat.completions.create(
+                        model=NARRATIVE_MODEL,
+                        messages=messages,
+                        temperature=0.7,
+                        max_tokens=max_tokens,
+                        stream=True,
+                        stream_options={"include_usage": True}
+                    )
+                    for chunk in stream:
+                        if getattr(chunk, 'usage', None):
+                            self.metrics.record_usage(chunk, NARRATIVE_MODEL)
+                        if not chunk.choices or not chunk.choices[0].delta.content:
+                            continue
+                        if not pieces:
+                            self.metrics.observe('narrative_first_token', time.perf_counter() - started)
+                        pieces.append(chunk.choices[0].delta.content)
+                        on_text(chunk.choices[0].delta.content)
+                except Exception as e:
+                    if pieces:
+                        # Text already reached on_text; retrying would duplicate it
+                        raise RuntimeError(f"Narrative stream interrupted: {str(e)}") from e
+                    raise
+                self.metrics.observe('narrative_request', time.perf_counter() - started)
+            return "".join(pieces)
+
+        text = self.requests.call(send)
+        self.metrics.increment('requests', endpoint='narrative')
+        if cache_key and text:
+            self.cache.put(cache_key, text)
+        return text
+
+    def create_natural_narrative(self, grouped_scenes, on_text=None, partial=None, style=None):
+        """Create the whole narrative in one request"""
         try:
-            self.progress.update_status("Creating natural narrative...")
-            
-            narrative_prompt = """You are a 50-year-old retired Army veteran giving a video tour. 
-            Write exactly as you would naturally speak while showing someone around.
-
-            Essential guidelines:
-            - Use everyday language you'd use in normal conversation
-            - NO marketing language or flowery descriptions
-            - Speak like you're talking to a friend or family member
-            - Keep transitions simple ("Let's head to the kitchen" not "Moving along to our next space")
-            - Only mention things worth pointing out
-            - Keep descriptions brief and practical
-            - Include timestamps only when changing locations or pointing out something specific
-
-            Write like this:
-            "Here's the living room. Big windows give you plenty of natural light. Nice view of the mountains from here."
-
-            Not like this:
-            "As we gracefully transition into this elegantly appointed living space, you'll be captivated by the abundant natural illumination..."
-
-            Remember: You're a regular person showing someone around - not a marketing writer."""
-
-            # Prepare scene descriptions
-            scene_content = []
-            for scene in grouped_scenes:
-                scene_start = self.format_time(scene[0]['timestamp'])
-                descriptions = [frame['narration'] for frame in scene]
-                scene_content.append(f"Location starting at [{scene_start}]:\n" + 
-                                   "\n".join(descriptions))
+            style = self.resolve_style(style)
+            self.update_status(f"Creating {style.name} narrative...")
             
-            full_context = "\n\n=== Location Change ===\n\n".join(scene_content)
+            full_context = SCENE_SEPARATOR.join(self.budgeted_contexts(grouped_scenes))
+            user_content = f"{style.opening}\n\n{full_context}"
             
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": narrative_prompt},
-                    {"role": "user", "content": f"Give a natural tour based on these scenes. Talk like you normally would:\n\n{full_context}"}
-                ],
-                temperature=0.7,
-                max_tokens=4000
-            )
-            
-            return response.choices[0].message.content
+            if on_text:
+                return self.stream_narrative(style.system_prompt, user_content, on_text, partial=partial)
+            return self.request_narrative(style.system_prompt, user_content)
+
+        except Exception as e:
+            raise Exception(f"Error generating narrative: {str(e)}")
+
+    def chunk_scenes(self, grouped_scenes):
+        """Split scenes into chunks whose prompt text fits the chunk budget.
+
+        Scenes are never split; a single oversized scene becomes its own chunk.
+        In "scenes" mode every scene is its own chunk, so an edit only
+        regenerates the scenes (and seams) whose input changed.
+        """
+        if self.mode == "scenes":
+            return [[scene] for scene in grouped_scenes]
+        chunks = []
+        current, size = [], 0
+        for scene in grouped_scenes:
+            scene_size = len(self.scene_context(scene))
+            if current and size + scene_size > self.chunk_chars:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(scene)
+            size += scene_size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def carry_over_context(self, chunk):
+        """Short note about where the previous chunk ended, for continuity."""
+        last_scene = chunk[-1]
+        last_description = last_scene[-1]['narration'][:CARRY_OVER_CHARS]
+        return (f"The tour so far ended at [{self.format_time(last_scene[-1]['timestamp'])}] "
+                f"in a location described as: {last_description}")
+
+    def narrate_chunk(self, chunk, previous_chunk=None, style=None):
+        """Narrate one chunk of scenes, continuing from the previous chunk."""
+        style = self.resolve_style(style)
+        context = SCENE_SEPARATOR.join(self.scene_context(scene) for scene in chunk)
+        if previous_chunk is None:
+            user_content = f"{style.opening}\n\n{context}"
+        else:
+            user_content = f"{self.carry_over_context(previous_chunk)}\n\n{style.continuation}\n\n{context}"
+        return self.request_narrative(style.system_prompt, user_content, CHUNK_MAX_TOKENS)
+
+    def stitch_transition(self, previous_segment, segment):
+        """Rewrite the opening paragraph of a segment so it follows on smoothly."""
+        paragraphs = segment.strip().split("\n\n")
+        previous_paragraph = previous_segment.strip().split("\n\n")[-1]
+        opening = self.request_narrative(
+            STITCH_PROMPT,
+            f"End of the previous part:\n{previous_paragraph}\n\n"
+            f"Opening paragraph to rewrite:\n{paragraphs[0]}",
+            STITCH_MAX_TOKENS
+        ).strip()
+        if opening:
+            paragraphs[0] = opening
+        return "\n\n".join(paragraphs)
+
+    def create_hierarchical_narrative(self, grouped_scenes, on_text=None, style=None):
+        """Narrate scene chunks in parallel, then smooth the seams between them.
+
+        Each chunk gets a short carry-over note from the end of the previous
+        chunk's input, so chunks can run concurrently. Each seam is then
+        smoothed independently, which keeps both passes parallel and every
+        request well inside the context window however long the video is.
+        With on_text, finished segments are passed on in script order as
+        soon as their seam is smoothed.
+        """
+        try:
+            style = self.resolve_style(style)
+            chunks = self.chunk_scenes(grouped_scenes)
+            self.update_status(f"Narrating {len(chunks)} scene chunks ({style.name})...")
+            previous_chunks = [None] + chunks[:-1]
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_chunks) as executor:
+                segments = list(executor.map(self.narrate_chunk, chunks, previous_chunks,
+                                             [style] * len(chunks)))
+
+                self.update_status(f"Smoothing transitions between chunks ({style.name})...")
+                pieces = [segments[0].strip()]
+                if on_text:
+                    on_text(pieces[0])
+                for piece in executor.map(self.stitch_transition, segments[:-1], segments[1:]):
+                    pieces.append(piece)
+                    if on_text:
+                        on_text("\n\n" + piece)
+
+            return "\n\n".join(pieces)
 
         except Exception as e:
             raise Exception(f"Error generating narrative: {str(e)}")
 
+    def resolve_mode(self, grouped_scenes):
+        """Single-request or hierarchical generation for these scenes.
+
+        Narratives are cached per request, so only "scenes" mode regenerates
+        just the scenes whose frames changed. "auto" (the default, used by the
+        GUI) sends one request for anything up to chunk_chars, so after an
+        edit that whole script is generated again.
+        """
+        if self.mode != "auto":
+            return self.mode
+        total_chars = sum(len(self.scene_context(scene)) for scene in grouped_scenes)
+        return "hierarchical" if total_chars > self.chunk_chars else "single"
+
+    def generate_narrative(self, grouped_scenes, on_text=None, partial=None, style=None):
+        """Pick single-request or chunked generation for the configured mode."""
+        if self.resolve_mode(grouped_scenes) in ("hierarchical", "scenes"):
+            return self.create_hierarchical_narrative(grouped_scenes, on_text, style)
+        return self.create_natural_narrative(grouped_scenes, on_text, partial, style)
+
+    def write_script(self, output_path, header, grouped_scenes, style=None):
+        """Generate the narrative into `<output>.part`, then move it into place.
+
+        In streaming mode text is appended and flushed as it arrives, so the
+        part file shows progress and survives a dropped connection. With
+        resume, a leftover part file from a single-request run is continued
+        rather than regenerated.
+        """
+        part_path = output_path.with_name(output_path.name + '.part')
+        partial = None
+        if (self.stream and self.resume and part_path.exists()
+                and self.resolve_mode(grouped_scenes) == "single"):
+            existing = part_path.read_text(encoding='utf-8')
+            if HEADER_END in existing:
+                partial = existing.split(HEADER_END, 1)[1] or None
+
+        with open(part_path, 'a' if partial else 'w', encoding='utf-8') as f:
+            if not partial:
+                f.write(header)
+            if not self.stream:
+                f.write(self.generate_narrative(grouped_scenes, style=style))
+            else:
+                received = 0
+
+                def append(text):
+                    nonlocal received
+                    f.write(text)
+                    f.flush()
+                    received += 1
+                    if received % STREAM_STATUS_INTERVAL == 0:
+                        self.update_status(f"Writing {self.resolve_style(style).name} narrative... "
+                                           f"{received} chunks received")
+
+                if partial:
+                    self.update_status(f"Resuming narrative after {len(partial)} characters...")
+                self.generate_narrative(grouped_scenes, on_text=append, partial=partial, style=style)
+
+        os.replace(part_path, output_path)
+
     def create_narrative_script(self, json_path):
-        """Create the complete narrative script"""
+        """Create the complete narrative script in the formatter's style"""
+        return self.create_narrative_scripts(json_path)[self.style.name]
+
+    def create_narrative_scripts(self, json_path, styles=None):
+        """Create one script per narrator style from a single load of the analysis.
+
+        Frames are read and segmented once, and the scene contexts are
+        compacted once. A single style is generated on the calling thread;
+        several are generated concurrently. Requests from all styles share
+        the formatter's client, concurrency limit and cache. Returns the
+        output path for each style name.
+        """
         try:
-            self.progress.update_status("Reading analysis data...")
+            styles = [self.resolve_style(style) for style in (styles or [self.style])]
+            self.update_status("Reading analysis data...")
             
-            with open(json_path, 'r') as f:
-                data = json.load(f)
+            with self.metrics.timer('load_analysis'):
+                header = read_header(json_path)
 
             output_dir = Path(json_path).parent
-            video_name = data['video_name']
-            total_duration = data['metadata']['duration']
-            current_date = datetime.now().strftime("%B %d, %Y")
+            video_name = header['video_name']
+            header_fields = {
+                'title': video_name.replace('_', ' ').title(),
+                'date': datetime.now().strftime("%B %d, %Y"),
+                'duration': self.format_time(header['metadata']['duration'])
+            }
 
-            self.progress.update_status("Analyzing scenes...")
-            grouped_scenes = self.identify_scene_changes(data['frames'])
+            self.update_status("Analyzing scenes...")
+            grouped_scenes = self.identify_scene_changes(iter_frames(json_path))
 
-            script_content = self.script_header.format(
-                title=video_name.replace('_', ' ').title(),
-                date=current_date,
-                duration=self.format_time(total_duration)
-            )
+            names = ", ".join(style.name for style in styles)
+            self.update_status(f"Creating narratives ({names})...")
+            output_paths = {style.name: style.output_path(output_dir, video_name) for style in styles}
+            with self.metrics.timer('narrative_generation'):
+                if len(styles) == 1:
+                    style = styles[0]
+                    self.write_script(output_paths[style.name], style.header.format(**header_fields),
+                                      grouped_scenes, style)
+                else:
+                    with ThreadPoolExecutor(max_workers=len(styles)) as executor:
+                        futures = [
+                            executor.submit(self.write_script, output_paths[style.name],
+                                            style.header.format(**header_fields), grouped_scenes, style)
+                            for style in styles
+                        ]
+                        # A failed style doesn't stop the others from finishing
+                        for future in futures:
+                            future.result()
 
-            self.progress.update_status("Creating natural narrative...")
-            narrative = self.create_natural_narrative(grouped_scenes)
-            script_content += narrative
+            if self.cache:
+                self.cache.evict()
+                logging.info(f"Narrative cache: {self.cache.stats()}")
 
-            self.progress.update_status("Saving script...")
-            output_path = output_dir / f"{video_name}_natural_narrative.txt"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(script_content)
+            self.metrics.write_json(output_dir / 'narrative_metrics.json', video=video_name)
+            self.metrics.write_prometheus(output_dir / 'narrative_metrics.prom', video=video_name)
 
-            return str(output_path)
+            return {name: str(path) for name, path in output_paths.items()}
 
         except Exception as e:
             raise Exception(f"Error creating script: {str(e)}")
 
 def main():
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
     root = tk.Tk()
     root.withdraw()
 
     try:
         json_path = filedialog.askopenfilename(
-            title="Select narration_results.json file",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            title="Select narration_results file",
+            filetypes=[("Narration results", "*.jsonl *.json"), ("All files", "*.*")],
             initialdir=os.path.expanduser("~\\Documents")
         )
 
         if json_path:
+            events = ProgressBus()
             progress_window = ProgressWindow("Creating Natural Narrative")
-            formatter = NaturalNarrativeFormatter(progress_window)
-            output_path = formatter.create_narrative_script(json_path)
+            formatter = NaturalNarrativeFormatter(stream=True, events=events)
+            # Generation runs on a worker thread so the window stays responsive
+            output_path = run_in_background(
+                progress_window, events, lambda: formatter.create_narrative_script(json_path)
+            )
             progress_window.close()
             
             messagebox.showinfo(
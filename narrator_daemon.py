@@ -0,0 +1,179 @@
+"""Long-running narrator worker that keeps clients, connections and caches warm.
+
+Usage:
+    python narrator_daemon.py [--port 8791] [--max-jobs 2] [--max-concurrent-requests 8]
+
+Heavy modules are imported once, and one OpenAI client (with its HTTP
+connection pool), one rate limiter and the open description and narrative
+caches are shared by every job. Jobs are queued over a local TCP socket
+with narrator_submit.py and run like batch_narrate.py runs a single
+video. The protocol is one JSON object per line in each direction.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import batch_narrate
+from narrator_submit import DEFAULT_HOST, DEFAULT_PORT
+from api_requests import create_client
+from rate_limiter import RateLimiter
+from result_cache import open_cache, DESCRIPTION_CACHE, NARRATIVE_CACHE
+# Imported up front so the first job doesn't pay for them
+import video_processor  # noqa: F401
+import narrative_formatter  # noqa: F401
+import pipeline_runner  # noqa: F401
+
+# Daemon defaults
+DEFAULT_MAX_JOBS = 2
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_REQUESTS_PER_MINUTE = 100
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 1000
+
+
+class NarratorDaemon:
+    """Job queue and the shared resources its jobs run with."""
+
+    def __init__(self, max_jobs=DEFAULT_MAX_JOBS, max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=None):
+        self.client = create_client()
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.request_slots = threading.BoundedSemaphore(max(1, max_concurrent_requests))
+        self.caches = {'description_cache': open_cache(DESCRIPTION_CACHE),
+                       'narrative_cache': open_cache(NARRATIVE_CACHE)}
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_jobs))
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Condition()
+
+    def submit(self, argv, cwd):
+        """Queue one job per video; arguments are batch_narrate.py's."""
+        try:
+            args = batch_narrate.parse_args(argv)
+        except SystemExit:
+            return {'status': 'error', 'error': f"Invalid job arguments: {' '.join(argv)}"}
+        args.paths = [str(Path(cwd, path)) for path in args.paths]
+        if args.output_root:
+            args.output_root = str(Path(cwd, args.output_root))
+        try:
+            videos = batch_narrate.find_videos(args.paths, args.recursive)
+        except FileNotFoundError as e:
+            return {'status': 'error', 'error': str(e)}
+
+        options = batch_narrate.build_options(args)
+        # Jobs run with --no-cache ignore the shared caches
+        shared = {'client': self.client, 'rate_limiter': self.rate_limiter, **self.caches}
+        submitted = []
+        for video in videos:
+            with self._lock:
+                job = {'id': str(next(self._ids)), 'video': str(video), 'state': 'queued',
+                       'submitted': time.time()}
+                self.jobs[job['id']] = job
+            self.executor.submit(self._run, job, video, options, shared)
+            submitted.append(dict(job))
+        return {'status': 'ok', 'jobs': submitted}
+
+    def _run(self, job, video, options, shared):
+        with self._lock:
+            job['state'] = 'running'
+        result = batch_narrate.process_one(video, options, self.request_slots, shared)
+        logging.info(f"Job {job['id']} finished: {json.dumps(result)}")
+        with self._lock:
+            job['state'] = 'done'
+            job['result'] = result
+            self._forget_old_jobs()
+            self._lock.notify_all()
+
+    def _forget_old_jobs(self):
+        done = [job_id for job_id, job in self.jobs.items() if job['state'] == 'done']
+        for job_id in done[:max(0, len(done) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def status(self, job_ids=None):
+        with self._lock:
+            jobs = [dict(self.jobs[job_id]) for job_id in (job_ids or self.jobs) if job_id in self.jobs]
+        return {'status': 'ok', 'jobs': jobs}
+
+    def wait(self, job_ids):
+        """Block until every listed job has finished."""
+        with self._lock:
+            self._lock.wait_for(lambda: all(self.jobs.get(job_id, {}).get('state', 'done') == 'done'
+                                            for job_id in job_ids))
+        return self.status(job_ids)
+
+    def handle(self, request):
+        command = request.get('command')
+        if command == 'submit':
+            return self.submit(request.get('args', []), request.get('cwd', os.getcwd()))
+        if command == 'status':
+            return self.status(request.get('job_ids'))
+        if command == 'wait':
+            return self.wait(request.get('job_ids', []))
+        if command == 'ping':
+            return {'status': 'ok'}
+        return {'status': 'error', 'error': f"Unknown command: {command}"}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            if request.get('command') == 'shutdown':
+                reply = {'status': 'ok'}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                reply = self.server.daemon_state.handle(request)
+        except Exception as e:
+            logging.error(f"Error handling request: {str(e)}")
+            reply = {'status': 'error', 'error': str(e)}
+        self.wfile.write((json.dumps(reply) + "\n").encode('utf-8'))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a warm narrator worker that accepts jobs over a local socket.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Interface to listen on (keep it local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS, help="Videos processed at once")
+    parser.add_argument('--max-concurrent-requests', type=int, default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        help="Cap on in-flight API requests across all jobs")
+    parser.add_argument('--requests-per-minute', type=int, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help="Request quota shared by all jobs")
+    parser.add_argument('--tokens-per-minute', type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args(argv)
+    state = NarratorDaemon(args.max_jobs, args.max_concurrent_requests,
+                           args.requests_per_minute, args.tokens_per_minute)
+    with _Server((args.host, args.port), _RequestHandler) as server:
+        server.daemon_state = state
+        logging.info(f"Narrator daemon listening on {args.host}:{args.port}")
+        server.serve_forever()
+    logging.info("Shutting down after running jobs finish")
+    state.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Narrator styles for narrative_formatter.py.
+
+A style is everything that differs between kinds of script: the narrator's
+system prompt, how scenes are introduced in requests, the script header and
+the output file suffix. Loading, scene segmentation, prompt compaction,
+caching and request handling are shared, so one formatter run can write
+several styles from the same analysis.
+"""
+from pathlib import Path
+
+NATURAL_NARRATIVE_PROMPT = """You are a 50-year-old retired Army veteran giving a video tour. 
+Write exactly as you would naturally speak while showing someone around.
+
+Essential guidelines:
+- Use everyday language you'd use in normal conversation
+- NO marketing language or flowery descriptions
+- Speak like you're talking to a friend or family member
+- Keep transitions simple ("Let's head to the kitchen" not "Moving along to our next space")
+- Only mention things worth pointing out
+- Keep descriptions brief and practical
+- Include timestamps only when changing locations or pointing out something specific
+
+Write like this:
+"Here's the living room. Big windows give you plenty of natural light. Nice view of the mountains from here."
+
+Not like this:
+"As we gracefully transition into this elegantly appointed living space, you'll be captivated by the abundant natural illumination..."
+
+Remember: You're a regular person showing someone around - not a marketing writer."""
+UNIFIED_NARRATIVE_PROMPT = ("Create a single, flowing narrative script from these scene descriptions. "
+                            "The narrator is a 50-year-old retired Army veteran. Key points:\n\n"
+                            "- Combine all descriptions into one coherent story\n"
+                            "- Use clear, direct language\n"
+                            "- Keep a professional but approachable tone\n"
+                            "- Create smooth transitions between scenes\n"
+                            "- Maintain timestamps but integrate them naturally\n"
+                            "- Focus on practical details and clear directions\n"
+                            "The narrative should flow naturally as one complete script, "
+                            "not as separate scene descriptions.")
+
+NATURAL_HEADER = """NARRATION SCRIPT
+{title}
+Duration: {duration}
+Generated: {date}
+
+Narrator: Veteran Tour Guide
+- Natural, conversational style
+- Clear and direct descriptions
+- Simple location transitions
+- Practical observations
+
+=====================================================
+
+"""
+UNIFIED_HEADER = """PROFESSIONAL NARRATION SCRIPT
+{title}
+Duration: {duration}
+Generated: {date}
+
+Narrator Profile: Male, 50s, Army veteran
+Style Notes:
+- Clear, direct communication style
+- Professional but conversational tone
+- Straightforward descriptions
+- Natural, measured pacing
+- Military precision without being rigid
+
+=====================================================
+
+"""
+
+DEFAULT_STYLE = "natural"
+
+
+class NarratorStyle:
+    """Prompts, header and output name for one kind of narration script.
+
+    ``opening`` introduces the scene descriptions in the first request;
+    ``continuation`` follows the carry-over note when a later chunk of
+    scenes is narrated on its own.
+    """
+
+    def __init__(self, name, system_prompt, opening, continuation, header, output_suffix):
+        self.name = name
+        self.system_prompt = system_prompt
+        self.opening = opening
+        self.continuation = continuation
+        self.header = header
+        self.output_suffix = output_suffix
+
+    def output_path(self, output_dir, video_name):
+        return Path(output_dir) / f"{video_name}{self.output_suffix}"
+
+
+NARRATOR_STYLES = {
+    style.name: style for style in (
+        NarratorStyle(
+            "natural", NATURAL_NARRATIVE_PROMPT,
+            opening="Give a natural tour based on these scenes. Talk like you normally would:",
+            continuation=("Continue the same tour from there. Don't greet the viewer again or recap "
+                          "what came before. Talk like you normally would:"),
+            header=NATURAL_HEADER,
+            output_suffix="_natural_narrative.txt"
+        ),
+        NarratorStyle(
+            "unified", UNIFIED_NARRATIVE_PROMPT,
+            opening="Create a single, flowing narrative that combines all these scenes into one coherent script:",
+            continuation=("Continue the same script from there, keeping it one flowing narrative. "
+                          "Don't reintroduce the video or recap what came before:"),
+            header=UNIFIED_HEADER,
+            output_suffix="_unified_narrative.txt"
+        )
+    )
+}
+
+
+def register_style(style):
+    """Add or replace a style so formatters can request it by name."""
+    NARRATOR_STYLES[style.name] = style
+    return style
+
+
+def get_style(style):
+    """A NarratorStyle, given one or its registered name."""
+    if isinstance(style, NarratorStyle):
+        return style
+    try:
+        return NARRATOR_STYLES[style]
+    except KeyError:
+        raise ValueError(f"Unknown narrator style: {style} (available: {', '.join(NARRATOR_STYLES)})")
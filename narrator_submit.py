@@ -0,0 +1,83 @@
+"""Thin client for the narrator worker daemon.
+
+Usage:
+    python narrator_submit.py submit VIDEO_OR_DIR [...] [batch options] [--wait]
+    python narrator_submit.py status [JOB_ID ...]
+    python narrator_submit.py wait JOB_ID [...]
+    python narrator_submit.py shutdown
+
+Options after the paths are the same as batch_narrate.py's and are parsed
+by the daemon. Only the standard library is imported here, so submitting
+a job costs milliseconds; the daemon (narrator_daemon.py) keeps the heavy
+modules, API client and rate limiter warm between jobs.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.getenv('NARRATOR_DAEMON_PORT', 8791))
+
+
+def send_command(payload, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None):
+    """Send one JSON request line to the daemon and return its JSON reply."""
+    with socket.create_connection((host, port), timeout=10) as connection:
+        connection.settimeout(timeout)
+        connection.sendall((json.dumps(payload) + "\n").encode('utf-8'))
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    if not reply:
+        raise ConnectionError("Daemon closed the connection without replying")
+    return json.loads(reply)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Submit jobs to a running narrator_daemon.py.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help="Queue videos using batch_narrate.py options")
+    submit.add_argument('--wait', action='store_true', help="Block until the submitted jobs finish")
+    commands.add_parser('status', help="Show jobs").add_argument('job_ids', nargs='*')
+    commands.add_parser('wait', help="Block until jobs finish").add_argument('job_ids', nargs='+')
+    commands.add_parser('shutdown', help="Stop the daemon after running jobs finish")
+    return parser.parse_known_args(argv)
+
+
+def main(argv=None):
+    args, job_args = parse_args(argv)
+    if args.command != 'submit' and job_args:
+        print(f"Unexpected arguments: {' '.join(job_args)}", file=sys.stderr)
+        return 2
+
+    try:
+        if args.command == 'submit':
+            # Relative paths are resolved by the daemon against our working directory
+            reply = send_command({'command': 'submit', 'args': job_args, 'cwd': os.getcwd()},
+                                 args.host, args.port)
+            if args.wait and reply.get('status') == 'ok':
+                reply = send_command({'command': 'wait', 'job_ids': [job['id'] for job in reply['jobs']]},
+                                     args.host, args.port)
+        elif args.command in ('status', 'wait'):
+            reply = send_command({'command': args.command, 'job_ids': args.job_ids}, args.host, args.port)
+        else:
+            reply = send_command({'command': 'shutdown'}, args.host, args.port)
+    except OSError as e:
+        print(json.dumps({'status': 'error', 'error': f"Cannot reach daemon on {args.host}:{args.port}: {e}"}))
+        return 2
+
+    print(json.dumps(reply))
+    if reply.get('status') != 'ok':
+        return 1
+    return 1 if any(job.get('result', {}).get('status') == 'error' for job in reply.get('jobs', [])) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Pipelined analysis and narration of one video.
+
+Usage:
+    python pipeline_runner.py VIDEO [options]
+
+Stages run concurrently with bounded queues between them:
+
+    decode/encode -> vision analysis -> online scene segmentation -> per-scene narration
+
+Frames flow to the segmenter in timestamp order as soon as they are
+analyzed, and each scene is narrated as soon as it is complete, so early
+scenes are narrated while later frames are still being analyzed. The
+outputs match running video_processor.py and then narrative_formatter.py
+(in "scenes" mode), plus a pipeline_metrics.json for the whole run. With
+several narrator styles, each scene is narrated once per style and every
+style's script is written alongside the others.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from moviepy import VideoFileClip
+
+from video_processor import EnhancedVideoAnalyzer
+from narrative_formatter import NaturalNarrativeFormatter
+from progress_events import ProgressBus, ConsoleReporter
+from run_metrics import RunMetrics
+from scene_segmentation import OnlineSceneSegmenter
+from narrator_styles import NARRATOR_STYLES, DEFAULT_STYLE
+from frame_source import DEFAULT_CHANGE_THRESHOLD, DEFAULT_MIN_GAP, DEFAULT_MAX_GAP
+
+# Frame records buffered between analysis and segmentation
+DEFAULT_FRAME_QUEUE_SIZE = 256
+# How long a blocked stage waits before re-checking for cancellation
+POLL_SECONDS = 0.5
+
+_DONE = object()
+
+
+class PipelineCancelled(Exception):
+    """Raised inside the analysis stage when a later stage has failed."""
+
+
+class PipelinedRunner:
+    """Run analysis and narration for one video as overlapping stages."""
+
+    def __init__(self, video_path, analyzer_options=None, formatter_options=None,
+                 frame_queue_size=DEFAULT_FRAME_QUEUE_SIZE, events=None, metrics=None, styles=None):
+        self.video_path = str(video_path)
+        self.events = events or ProgressBus()
+        self.metrics = metrics or RunMetrics()
+        self.frames = queue.Queue(maxsize=frame_queue_size)
+        self._cancelled = threading.Event()
+        self._analysis_error = None
+        self._analysis_result = None
+
+        self.analyzer = EnhancedVideoAnalyzer(
+            self.video_path, events=self.events, metrics=self.metrics,
+            on_frame=self._enqueue_frame, **(analyzer_options or {})
+        )
+        self.formatter = NaturalNarrativeFormatter(
+            events=self.events, metrics=self.metrics, mode="scenes", **(formatter_options or {})
+        )
+        self.styles = [self.formatter.resolve_style(style) for style in (styles or [self.formatter.style])]
+        self.segmenter = OnlineSceneSegmenter(min_scene_seconds=self.formatter.min_scene_seconds)
+
+    def _enqueue_frame(self, record):
+        # Blocks when segmentation/narration fall behind, which throttles analysis
+        while True:
+            if self._cancelled.is_set():
+                raise PipelineCancelled("Pipeline stopped by a later stage")
+            try:
+                self.frames.put(record, timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _run_analysis(self):
+        try:
+            self._analysis_result = self.analyzer.process_video()
+        except Exception as e:
+            self._analysis_error = e
+        finally:
+            while True:
+                try:
+                    self.frames.put(_DONE, timeout=POLL_SECONDS)
+                    break
+                except queue.Full:
+                    if self._cancelled.is_set():
+                        break
+
+    def _iter_frames(self):
+        """Analyzed frames in timestamp order; failed frames have nothing to narrate."""
+        while True:
+            record = self.frames.get()
+            if record is _DONE:
+                return
+            if record.get('narration'):
+                yield record
+
+    def _iter_scenes(self):
+        for frame in self._iter_frames():
+            yield from self.segmenter.add(frame)
+        yield from self.segmenter.finish()
+
+    def update_progress(self, written, total, style):
+        self.events.publish(f"Narrated {written} of {total} scenes found so far ({style.name})",
+                            stage='narration', completed=written)
+
+    def header_fields(self):
+        with VideoFileClip(self.video_path, audio=False) as clip:
+            duration = clip.duration
+        return {
+            'title': self.analyzer.video_name.replace('_', ' ').title(),
+            'date': datetime.now().strftime("%B %d, %Y"),
+            'duration': self.formatter.format_time(duration)
+        }
+
+    def run(self):
+        """Run all stages; returns the analysis results and narrative script paths.
+
+        'narrative' is the first style's script; 'narratives' maps every
+        style name to its script.
+        """
+        started = time.perf_counter()
+        self.analyzer.output_dir.mkdir(parents=True, exist_ok=True)
+        header_fields = self.header_fields()
+        scripts = []
+        for style in self.styles:
+            output_path = style.output_path(self.analyzer.output_dir, self.analyzer.video_name)
+            scripts.append({
+                'style': style,
+                'output_path': output_path,
+                'part_path': output_path.with_name(output_path.name + '.part'),
+                'narrations': [],
+                'pieces': [],
+                'written': 0
+            })
+
+        analysis = threading.Thread(target=self._run_analysis, daemon=True)
+        analysis.start()
+        max_pending = 2 * self.formatter.max_concurrent_chunks
+        scenes = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.formatter.max_concurrent_chunks) as narrate_pool, \
+                    ThreadPoolExecutor(max_workers=self.formatter.max_concurrent_chunks) as stitch_pool, \
+                    contextlib.ExitStack() as files:
+                for script in scripts:
+                    script['file'] = files.enter_context(open(script['part_path'], 'w', encoding='utf-8'))
+                    script['file'].write(script['style'].header.format(**header_fields))
+
+                def write_ready(script, backlog):
+                    # Write finished pieces in order, waiting while more than `backlog` are unwritten
+                    pieces = script['pieces']
+                    while script['written'] < len(pieces):
+                        written = script['written']
+                        if not pieces[written].done() and len(pieces) - written <= backlog:
+                            return
+                        piece = pieces[written].result().strip()
+                        script['file'].write(piece if written == 0 else "\n\n" + piece)
+                        script['file'].flush()
+                        script['written'] += 1
+                        self.update_progress(script['written'], len(pieces), script['style'])
+
+                def release_when_narrated(scene, scene_narrations):
+                    # Once every style has its request, the scene's compacted text isn't needed
+                    def release(_):
+                        if all(narration.done() for narration in scene_narrations):
+                            self.formatter.forget_scene(scene)
+                    for narration in scene_narrations:
+                        narration.add_done_callback(release)
+
+                previous_scene = None
+                for scene in self._iter_scenes():
+                    previous_chunk = [previous_scene] if previous_scene is not None else None
+                    scene_narrations = []
+                    for script in scripts:
+                        narrations = script['narrations']
+                        narration = narrate_pool.submit(self.formatter.narrate_chunk, [scene], previous_chunk,
+                                                        script['style'])
+                        if narrations:
+                            piece = stitch_pool.submit(
+                                lambda a, b: self.formatter.stitch_transition(a.result(), b.result()),
+                                narrations[-1], narration
+                            )
+                        else:
+                            piece = narration
+                        narrations.append(narration)
+                        scene_narrations.append(narration)
+                        script['pieces'].append(piece)
+                        write_ready(script, max_pending)
+                    release_when_narrated(scene, scene_narrations)
+                    previous_scene = scene
+                    scenes += 1
+                    self.metrics.increment('scenes')
+
+                for script in scripts:
+                    write_ready(script, 0)
+        except Exception:
+            self._cancelled.set()
+            raise
+        finally:
+            analysis.join()
+
+        if self._analysis_error:
+            raise self._analysis_error
+        if not scenes:
+            raise ValueError("No frames could be analyzed, nothing to narrate")
+        for script in scripts:
+            os.replace(script['part_path'], script['output_path'])
+
+        self.metrics.observe('pipeline', time.perf_counter() - started)
+        self.metrics.write_json(self.analyzer.output_dir / 'pipeline_metrics.json',
+                                video=self.analyzer.video_name)
+        narratives = {script['style'].name: str(script['output_path']) for script in scripts}
+        return {'analysis': self._analysis_result, 'narrative': narratives[self.styles[0].name],
+                'narratives': narratives}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a video and narrate it in one pipelined run.")
+    parser.add_argument('video', help="Video file to process")
+    parser.add_argument('--output-root', default=None,
+                        help="Directory for the <video>_analysis folder (default: current directory)")
+    parser.add_argument('--threads', type=int, default=4, help="Frame analysis threads")
+    parser.add_argument('--decode-workers', type=int, default=1, help="Frame decoding processes")
+    parser.add_argument('--batch-size', type=int, default=1, help="Consecutive frames per vision request")
+    parser.add_argument('--sampling', choices=['fixed', 'adaptive'], default='fixed')
+    parser.add_argument('--change-threshold', type=float, default=DEFAULT_CHANGE_THRESHOLD,
+                        help="Adaptive sampling: picture change (0-1) that triggers a new sample")
+    parser.add_argument('--min-gap', type=float, default=DEFAULT_MIN_GAP,
+                        help="Adaptive sampling: minimum seconds between samples")
+    parser.add_argument('--max-gap', type=float, default=DEFAULT_MAX_GAP,
+                        help="Adaptive sampling: maximum seconds without a sample")
+    parser.add_argument('--narration-threads', type=int, default=4, help="Scenes narrated concurrently")
+    parser.add_argument('--styles', nargs='+', choices=sorted(NARRATOR_STYLES), default=[DEFAULT_STYLE],
+                        help="Narrator styles to write, each to its own script")
+    parser.add_argument('--resume', action='store_true', help="Resume frame analysis from its checkpoint")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Disable the frame description and narrative caches")
+    parser.add_argument('--quiet', action='store_true', help="Don't print progress to stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    events = ProgressBus()
+    runner = PipelinedRunner(
+        args.video,
+        analyzer_options={
+            'max_workers': args.threads,
+            'decode_workers': args.decode_workers,
+            'batch_size': args.batch_size,
+            'sampling': args.sampling,
+            'change_threshold': args.change_threshold,
+            'min_gap': args.min_gap,
+            'max_gap': args.max_gap,
+            'resume': args.resume,
+            'use_cache': not args.no_cache,
+            'output_root': args.output_root
+        },
+        formatter_options={
+            'max_concurrent_chunks': args.narration_threads,
+            'use_cache': not args.no_cache
+        },
+        events=events,
+        styles=args.styles
+    )
+    reporter = None if args.quiet else ConsoleReporter(events).start()
+    try:
+        result = runner.run()
+        status = {'video': args.video, 'status': 'ok', **result}
+    except Exception as e:
+        logging.error(f"Pipeline failed: {str(e)}")
+        status = {'video': args.video, 'status': 'error', 'error': str(e)}
+    finally:
+        if reporter:
+            reporter.stop()
+    print(json.dumps(status), flush=True)
+    return 0 if status['status'] == 'ok' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import abc
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+# Consumer refresh defaults
+DEFAULT_UI_REFRESH_MS = 100
+DEFAULT_CONSOLE_INTERVAL = 1.0
+# Events kept per lossy subscriber; UIs only ever show the latest ones
+DEFAULT_BACKLOG = 256
+
+
+class ProgressSubscription:
+    """One consumer's view of the bus, drained on the consumer's own schedule."""
+
+    def __init__(self, maxlen=DEFAULT_BACKLOG):
+        # deque append/popleft are atomic, so publishers never wait on consumers
+        self._events = deque(maxlen=maxlen)
+
+    def push(self, event):
+        self._events.append(event)
+
+    def drain(self):
+        """Return and remove all pending events, oldest first."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.popleft())
+            except IndexError:
+                return events
+
+
+class ProgressBus:
+    """Thread-safe fan-out of progress events from the pipeline to any consumers.
+
+    publish() never blocks: each subscriber has its own bounded buffer that
+    drops its oldest events when the consumer falls behind. Subscribe with
+    ``maxlen=None`` for consumers that must see every event, such as logs.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxlen=DEFAULT_BACKLOG):
+        subscription = ProgressSubscription(maxlen)
+        with self._lock:
+            self._subscribers = self._subscribers + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscription]
+
+    def publish(self, message, **fields):
+        """Send a status message with optional fields (stage, completed, total, ...)."""
+        event = {'time': time.time(), 'message': message, **fields}
+        for subscription in self._subscribers:
+            subscription.push(event)
+        return event
+
+
+class TkProgressPump:
+    """Refresh a ProgressWindow from the bus on the Tk thread via after().
+
+    Only the latest event is shown per refresh, so the UI costs the pipeline
+    nothing however fast events arrive. Known totals switch the progress bar
+    to determinate mode.
+    """
+
+    def __init__(self, window, bus, interval_ms=DEFAULT_UI_REFRESH_MS):
+        self.window = window
+        self.bus = bus
+        self.interval_ms = interval_ms
+        self.subscription = bus.subscribe()
+        self._job = None
+
+    def start(self):
+        self._job = self.window.root.after(self.interval_ms, self._poll)
+        return self
+
+    def stop(self):
+        if self._job is not None:
+            self.window.root.after_cancel(self._job)
+            self._job = None
+        self.bus.unsubscribe(self.subscription)
+
+    def _poll(self):
+        events = self.subscription.drain()
+        if events:
+            event = events[-1]
+            self.window.label.config(text=event['message'])
+            if event.get('total'):
+                progress = self.window.progress
+                if str(progress['mode']) != 'determinate':
+                    progress.stop()
+                    progress.config(mode='determinate', maximum=event['total'])
+                progress['value'] = event.get('completed') or 0
+        self._job = self.window.root.after(self.interval_ms, self._poll)
+
+
+class _ReporterThread(abc.ABC):
+    """Background thread draining one subscription at a fixed interval."""
+
+    def __init__(self, bus, interval, maxlen=DEFAULT_BACKLOG):
+        self.bus = bus
+        self.interval = interval
+        self.subscription = bus.subscribe(maxlen)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop after handling anything still pending."""
+        self._stop.set()
+        self._thread.join()
+        self.bus.unsubscribe(self.subscription)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.handle(self.subscription.drain())
+        self.handle(self.subscription.drain())
+
+    @abc.abstractmethod
+    def handle(self, events):
+        """Consume the events drained since the last call (possibly none)."""
+
+
+class ConsoleReporter(_ReporterThread):
+    """Print the latest status line at most once per interval."""
+
+    def __init__(self, bus, interval=DEFAULT_CONSOLE_INTERVAL, stream=None, prefix=""):
+        super().__init__(bus, interval)
+        self.stream = stream or sys.stderr
+        self.prefix = prefix
+
+    def handle(self, events):
+        if events:
+            self.stream.write(f"{self.prefix}{events[-1]['message']}\n")
+            self.stream.flush()
+
+
+class JsonLinesReporter(_ReporterThread):
+    """Append every event to a file (or stream) as one JSON object per line."""
+
+    def __init__(self, bus, output, interval=DEFAULT_CONSOLE_INTERVAL):
+        super().__init__(bus, interval, maxlen=None)
+        self.output = output
+
+    def handle(self, events):
+        if not events:
+            return
+        lines = "".join(json.dumps(event) + "\n" for event in events)
+        if hasattr(self.output, 'write'):
+            self.output.write(lines)
+            self.output.flush()
+        else:
+            with open(self.output, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+
+def run_in_background(window, bus, work, interval_ms=DEFAULT_UI_REFRESH_MS):
+    """Run work() on a worker thread while the Tk loop shows its progress.
+
+    Returns work()'s result, or re-raises its exception, once it finishes.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = work()
+        except Exception as e:
+            outcome['error'] = e
+
+    def check():
+        if thread.is_alive():
+            window.root.after(interval_ms, check)
+        else:
+            window.root.quit()
+
+    thread = threading.Thread(target=target, daemon=True)
+    pump = TkProgressPump(window, bus, interval_ms).start()
+    thread.start()
+    window.root.after(interval_ms, check)
+    window.root.mainloop()
+    pump.stop()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
@@ -0,0 +1,117 @@
+import math
+import re
+import zlib
+
+import numpy as np
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # tiktoken is optional; fall back to the usual ~4 characters per token
+    _ENCODING = None
+
+# Compaction defaults
+DEFAULT_SIMILARITY = 0.4
+DEFAULT_SCENE_TOKEN_BUDGET = 600
+DEFAULT_TOTAL_TOKEN_BUDGET = 24000
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 3
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(42)
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def count_tokens(text):
+    """Token count for prompt budgeting, computed locally."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.split(text or "") if sentence.strip()]
+
+
+def minhash(sentence):
+    """MinHash signature of a sentence's word shingles."""
+    words = WORD_PATTERN.findall(sentence.lower())
+    if len(words) >= SHINGLE_SIZE:
+        shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    else:
+        shingles = [" ".join(words)]
+    hashes = np.array([zlib.crc32(s.encode('utf-8')) for s in shingles], dtype=np.uint64)
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+
+def cluster_sentences(frames, similarity=DEFAULT_SIMILARITY):
+    """Group near-identical sentences across a scene's frames.
+
+    Returns clusters in first-appearance order, each with a representative
+    sentence, the first/last timestamps it covers and how many sentences it
+    absorbed. Each new sentence is compared with every cluster at once using
+    estimated Jaccard similarity of MinHash signatures.
+    """
+    clusters = []
+    signatures = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint64)
+    for frame in frames:
+        for sentence in split_sentences(frame.get('narration')):
+            signature = minhash(sentence)
+            if len(clusters):
+                scores = (signatures == signature).mean(axis=1)
+                best = int(scores.argmax())
+                if scores[best] >= similarity:
+                    clusters[best]['end'] = frame['timestamp']
+                    clusters[best]['count'] += 1
+                    continue
+            clusters.append({'sentence': sentence, 'start': frame['timestamp'],
+                             'end': frame['timestamp'], 'count': 1})
+            signatures = np.vstack([signatures, signature])
+    return clusters
+
+
+def render_clusters(clusters, format_time):
+    lines = []
+    for cluster in clusters:
+        start, end = format_time(cluster['start']), format_time(cluster['end'])
+        span = f"[{start}]" if start == end else f"[{start}-{end}]"
+        lines.append(f"{span} {cluster['sentence']}")
+    return "\n".join(lines)
+
+
+def fit_budget(clusters, format_time, token_budget):
+    """Drop the least-repeated clusters until the rendered text fits the budget."""
+    kept = list(clusters)
+    text = render_clusters(kept, format_time)
+    if not token_budget:
+        return text
+    # Remove in order of ascending support, latest first among ties
+    order = sorted(range(len(kept)), key=lambda i: (kept[i]['count'], -i))
+    dropped = set()
+    while count_tokens(text) > token_budget and len(dropped) < len(kept) - 1:
+        dropped.add(order[len(dropped)])
+        text = render_clusters([c for i, c in enumerate(kept) if i not in dropped], format_time)
+    return text
+
+
+def compact_scene(frames, format_time, token_budget=DEFAULT_SCENE_TOKEN_BUDGET,
+                  similarity=DEFAULT_SIMILARITY):
+    """Representative sentences with time ranges for one scene, within a token budget."""
+    return fit_budget(cluster_sentences(frames, similarity), format_time, token_budget)
+
+
+def compact_scenes(scenes, format_time, scene_budget=DEFAULT_SCENE_TOKEN_BUDGET,
+                   total_budget=DEFAULT_TOTAL_TOKEN_BUDGET, similarity=DEFAULT_SIMILARITY):
+    """Compact every scene, shrinking per-scene budgets if the total is over budget."""
+    clustered = [cluster_sentences(scene, similarity) for scene in scenes]
+    texts = [fit_budget(clusters, format_time, scene_budget) for clusters in clustered]
+    total = sum(count_tokens(text) for text in texts)
+    if total_budget and total > total_budget:
+        scale = total_budget / total
+        texts = [fit_budget(clusters, format_time, max(1, int(count_tokens(text) * scale)))
+                 for clusters, text in zip(clustered, texts)]
+    return texts
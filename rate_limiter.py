@@ -0,0 +1,66 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe requests/tokens-per-minute limiter for API calls.
+
+    Both limits are token buckets that refill continuously over a
+    one-minute window. A limit of None disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._request_allowance = float(requests_per_minute or 0)
+        self._token_allowance = float(tokens_per_minute or 0)
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_allowance = min(
+                self.requests_per_minute,
+                self._request_allowance + elapsed * self.requests_per_minute / 60.0
+            )
+        if self.tokens_per_minute:
+            self._token_allowance = min(
+                self.tokens_per_minute,
+                self._token_allowance + elapsed * self.tokens_per_minute / 60.0
+            )
+
+    def _wait_time(self, tokens):
+        """Seconds until both buckets can cover one request of `tokens`."""
+        wait = 0.0
+        if self.requests_per_minute and self._request_allowance < 1:
+            wait = max(wait, (1 - self._request_allowance) * 60.0 / self.requests_per_minute)
+        if self.tokens_per_minute and self._token_allowance < tokens:
+            wait = max(wait, (tokens - self._token_allowance) * 60.0 / self.tokens_per_minute)
+        return wait
+
+    def acquire(self, tokens=0):
+        """Block until a request estimated at `tokens` tokens may be sent."""
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._request_allowance -= 1
+                    if self.tokens_per_minute:
+                        self._token_allowance -= tokens
+                    return
+            time.sleep(wait)
+
+    def adjust(self, tokens):
+        """Charge (positive) or refund (negative) tokens once real usage is known."""
+        if not self.tokens_per_minute:
+            return
+        with self._lock:
+            self._refill()
+            self._token_allowance = min(self.tokens_per_minute, self._token_allowance - tokens)
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Run eviction after this many writes rather than on every put
+EVICTION_INTERVAL = 100
+
+# Caches shared by the analyzer and the formatter, and their limits
+DESCRIPTION_CACHE = "frame_descriptions"
+NARRATIVE_CACHE = "narrative_segments"
+CACHE_MAX_BYTES = {DESCRIPTION_CACHE: 200 * 1024 * 1024, NARRATIVE_CACHE: 50 * 1024 * 1024}
+DEFAULT_CACHE_MAX_AGE_DAYS = 90
+
+
+def default_cache_dir():
+    """Shared cache directory, overridable with NARRATOR_CACHE_DIR."""
+    return Path(os.getenv('NARRATOR_CACHE_DIR', Path.home() / '.cache' / 'video_narrator'))
+
+
+def make_cache_key(*parts):
+    """Hash strings/bytes into a single content-addressed key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Persistent SQLite key/value cache with LRU and age-based eviction.
+
+    Safe to share between threads; separate processes can point at the same
+    file and rely on SQLite's own locking.
+    """
+
+    def __init__(self, db_path, max_entries=None, max_bytes=None, max_age_days=None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+            'created REAL NOT NULL, last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)')
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute('SELECT value, created FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None or self._expired(row[1]):
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value):
+        """Store value under key, evicting old entries periodically."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)',
+                (key, value, len(value.encode('utf-8')), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def evict(self):
+        """Apply the age and size limits now."""
+        with self._lock:
+            self._evict()
+
+    def _expired(self, created):
+        return bool(self.max_age_days) and created < time.time() - self.max_age_days * 86400
+
+    def _evict(self):
+        if self.max_age_days:
+            self._conn.execute('DELETE FROM entries WHERE created < ?',
+                               (time.time() - self.max_age_days * 86400,))
+        if self.max_entries:
+            self._conn.execute(
+                'DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_used DESC '
+                'LIMIT -1 OFFSET ?)', (self.max_entries,)
+            )
+        if self.max_bytes:
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            rows = self._conn.execute('SELECT key, size FROM entries ORDER BY last_used').fetchall()
+            stale = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            self._conn.executemany('DELETE FROM entries WHERE key = ?', stale)
+        self._conn.commit()
+
+    def stats(self):
+        """Hit/miss counters and current cache size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': size
+        }
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._conn.close()
+
+
+def open_cache(name, cache_dir=None):
+    """Open a named cache (e.g. DESCRIPTION_CACHE) under cache_dir, or the shared cache directory."""
+    return ResultCache(
+        Path(cache_dir or default_cache_dir()) / f"{name}.sqlite",
+        max_bytes=CACHE_MAX_BYTES.get(name),
+        max_age_days=DEFAULT_CACHE_MAX_AGE_DAYS
+    )
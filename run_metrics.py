@@ -0,0 +1,141 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Prometheus histogram buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+PERCENTILES = (50, 90, 95, 99)
+METRIC_PREFIX = "narrator"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels)) + "}"
+
+
+class RunMetrics:
+    """Thread-safe per-stage timings and counters for one run.
+
+    Timings are kept as raw observations so percentiles are exact; counters
+    can carry labels (e.g. model) so token usage is split by what it paid for.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+        self.started = time.time()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._timings.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def record_usage(self, response, model):
+        """Count prompt/completion tokens from an API response's usage block."""
+        usage = getattr(response, 'usage', None)
+        if not usage:
+            return
+        self.increment('prompt_tokens', usage.prompt_tokens or 0, model=model)
+        self.increment('completion_tokens', usage.completion_tokens or 0, model=model)
+
+    def summary(self):
+        """Stage percentiles and counter totals as plain data."""
+        with self._lock:
+            timings = {stage: sorted(values) for stage, values in self._timings.items()}
+            counters = dict(self._counters)
+
+        stages = {}
+        for stage, values in timings.items():
+            total = sum(values)
+            stages[stage] = {
+                'count': len(values),
+                'total_seconds': round(total, 6),
+                'mean_seconds': round(total / len(values), 6),
+                'max_seconds': round(values[-1], 6),
+                **{f'p{pct}_seconds': round(percentile(values, pct), 6) for pct in PERCENTILES}
+            }
+
+        counter_report = {}
+        for (name, labels), value in sorted(counters.items()):
+            label = ",".join(f"{key}={val}" for key, val in labels)
+            counter_report[f"{name}[{label}]" if label else name] = value
+
+        return {
+            'started': self.started,
+            'wall_seconds': round(time.time() - self.started, 3),
+            'stages': stages,
+            'counters': counter_report
+        }
+
+    def write_json(self, path, **extra):
+        """Write the run report as JSON."""
+        report = {**extra, **self.summary()}
+        _atomic_write(path, json.dumps(report, indent=2))
+        return str(path)
+
+    def write_prometheus(self, path, **labels):
+        """Write a Prometheus textfile-collector file with histograms and counters."""
+        with self._lock:
+            timings = {stage: list(values) for stage, values in self._timings.items()}
+            counters = dict(self._counters)
+
+        base_labels = tuple(sorted(labels.items()))
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Time spent per pipeline stage operation.",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds histogram"
+        ]
+        for stage, values in sorted(timings.items()):
+            stage_labels = base_labels + (('stage', stage),)
+            for bucket in LATENCY_BUCKETS:
+                count = sum(1 for value in values if value <= bucket)
+                lines.append(f"{METRIC_PREFIX}_stage_seconds_bucket"
+                             f"{_label_text(stage_labels + (('le', bucket),))} {count}")
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_bucket"
+                         f"{_label_text(stage_labels + (('le', '+Inf'),))} {len(values)}")
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_sum{_label_text(stage_labels)} {sum(values)}")
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_count{_label_text(stage_labels)} {len(values)}")
+
+        declared = set()
+        for (name, counter_labels), value in sorted(counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{_label_text(base_labels + counter_labels)} {value}")
+
+        _atomic_write(path, "\n".join(lines) + "\n")
+        return str(path)
+
+
+def _atomic_write(path, text):
+    # Scrapers and readers must never see a half-written file
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    temp_path.write_text(text, encoding='utf-8')
+    os.replace(temp_path, path)
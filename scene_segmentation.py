@@ -0,0 +1,247 @@
+import re
+import zlib
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from frame_features import signature_from_hex
+
+# Segmentation defaults
+DEFAULT_EMBEDDING_DIM = 512
+DEFAULT_WINDOW = 4
+DEFAULT_MIN_SCENE_SECONDS = 5.0
+DEFAULT_MIN_NOVELTY = 0.2
+DEFAULT_STD_FACTOR = 2.0
+# dHash signature length stored with each frame
+SIGNATURE_BITS = 64
+
+WORD_PATTERN = re.compile(r"[a-z][a-z']+")
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have here in into is it its of on or that the
+there this to was were with you your we our they their which while where what can feel
+""".split())
+
+
+def text_embeddings(descriptions, dim=DEFAULT_EMBEDDING_DIM):
+    """Hashed bag-of-words embeddings, one L2-normalized row per description.
+
+    Words are hashed into `dim` buckets with log-scaled term counts, so no
+    vocabulary or model download is needed and cost is linear in text size.
+    """
+    rows, cols = [], []
+    for row, description in enumerate(descriptions):
+        for word in WORD_PATTERN.findall((description or "").lower()):
+            if word not in STOP_WORDS:
+                rows.append(row)
+                cols.append(zlib.crc32(word.encode('utf-8')) % dim)
+
+    matrix = np.zeros((len(descriptions), dim), dtype=np.float32)
+    np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+    matrix = np.log1p(matrix)
+    return normalize_rows(matrix)
+
+
+def signature_embeddings(signatures):
+    """Map stored hex dHash signatures to normalized +/-1 vectors."""
+    bits = np.array([signature_from_hex(value) for value in signatures], dtype=np.float32)
+    return normalize_rows(bits * 2.0 - 1.0)
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def frame_feature_matrix(frames, dim=DEFAULT_EMBEDDING_DIM, image_weight=1.0):
+    """Per-frame features: text embedding, plus the image signature when every frame has one."""
+    features = text_embeddings([frame.get('narration') for frame in frames], dim)
+    if image_weight and frames and all(frame.get('signature') for frame in frames):
+        image = signature_embeddings([frame['signature'] for frame in frames])
+        features = np.hstack([features, image_weight * image])
+    return normalize_rows(features)
+
+
+def novelty_curve(features, window=DEFAULT_WINDOW):
+    """Change score before each frame: 1 - cosine(mean of previous window, mean of next window).
+
+    Window means come from cumulative sums, so the whole curve is a handful
+    of vectorized operations regardless of frame count.
+    """
+    count = len(features)
+    novelty = np.zeros(count, dtype=np.float32)
+    if count < 2:
+        return novelty
+
+    cumulative = np.vstack([np.zeros((1, features.shape[1]), dtype=features.dtype),
+                            np.cumsum(features, axis=0)])
+    positions = np.arange(1, count)
+    left_start = np.maximum(positions - window, 0)
+    right_end = np.minimum(positions + window, count)
+    left = (cumulative[positions] - cumulative[left_start]) / (positions - left_start)[:, None]
+    right = (cumulative[right_end] - cumulative[positions]) / (right_end - positions)[:, None]
+    similarity = (normalize_rows(left) * normalize_rows(right)).sum(axis=1)
+    novelty[1:] = 1.0 - similarity
+    return novelty
+
+
+def find_boundaries(timestamps, novelty, min_scene_seconds=DEFAULT_MIN_SCENE_SECONDS,
+                    min_novelty=DEFAULT_MIN_NOVELTY, std_factor=DEFAULT_STD_FACTOR):
+    """Indices where a new scene starts, in frame order.
+
+    A candidate is a local maximum of the novelty curve above both
+    `min_novelty` and mean + `std_factor` * std. Candidates are accepted in
+    order of strength if they keep every scene at least `min_scene_seconds`.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(novelty) < 3:
+        return []
+
+    threshold = max(min_novelty, float(novelty.mean() + std_factor * novelty.std()))
+    peaks = np.zeros(len(novelty), dtype=bool)
+    peaks[1:-1] = (novelty[1:-1] >= novelty[:-2]) & (novelty[1:-1] > novelty[2:])
+    peaks[-1] = novelty[-1] > novelty[-2]
+    candidates = np.flatnonzero(peaks & (novelty >= threshold))
+    candidates = candidates[np.argsort(-novelty[candidates], kind='stable')]
+
+    start, end = timestamps[0], timestamps[-1]
+    accepted_times = [start]
+    accepted = []
+    for index in candidates:
+        t = timestamps[index]
+        if t - start < min_scene_seconds or end - t < min_scene_seconds:
+            continue
+        position = bisect_left(accepted_times, t)
+        if t - accepted_times[position - 1] < min_scene_seconds:
+            continue
+        if position < len(accepted_times) and accepted_times[position] - t < min_scene_seconds:
+            continue
+        insort(accepted_times, t)
+        accepted.append(int(index))
+    return sorted(accepted)
+
+
+def segment_scenes(frames, min_scene_seconds=DEFAULT_MIN_SCENE_SECONDS, window=DEFAULT_WINDOW,
+                   min_novelty=DEFAULT_MIN_NOVELTY, std_factor=DEFAULT_STD_FACTOR):
+    """Group frames into scenes using visual and textual change points."""
+    if not isinstance(frames, list):
+        frames = list(frames)
+    if not frames:
+        return []
+    features = frame_feature_matrix(frames)
+    novelty = novelty_curve(features, window)
+    boundaries = find_boundaries([frame['timestamp'] for frame in frames], novelty,
+                                 min_scene_seconds, min_novelty, std_factor)
+    edges = [0] + boundaries + [len(frames)]
+    return [frames[a:b] for a, b in zip(edges[:-1], edges[1:])]
+
+
+def frame_feature_row(frame, dim=DEFAULT_EMBEDDING_DIM, image_weight=1.0):
+    """Feature vector for a single frame, with a zero image part if it has no signature."""
+    text = text_embeddings([frame.get('narration')], dim)[0]
+    if not image_weight:
+        return text
+    if frame.get('signature'):
+        image = signature_embeddings([frame['signature']])[0]
+    else:
+        image = np.zeros(SIGNATURE_BITS, dtype=np.float32)
+    return normalize_rows(np.concatenate([text, image_weight * image])[None, :])[0]
+
+
+class OnlineSceneSegmenter:
+    """Scene segmentation for frames that arrive one at a time in timestamp order.
+
+    Novelty at a frame is computed once ``window`` later frames have arrived
+    and a boundary is decided one frame after that, so scenes are released
+    with a lag of about ``window + 1`` frames instead of waiting for the whole
+    video. The peak threshold uses the running mean and deviation of the
+    novelty seen so far, and boundaries are accepted greedily in order, so
+    results can differ slightly from ``segment_scenes`` on the full list.
+    Only frames of the open scene and a window of features are held.
+    """
+
+    def __init__(self, min_scene_seconds=DEFAULT_MIN_SCENE_SECONDS, window=DEFAULT_WINDOW,
+                 min_novelty=DEFAULT_MIN_NOVELTY, std_factor=DEFAULT_STD_FACTOR):
+        self.min_scene_seconds = min_scene_seconds
+        self.window = window
+        self.min_novelty = min_novelty
+        self.std_factor = std_factor
+        self._frames = {}
+        self._features = {}
+        self._novelty = {0: 0.0}
+        self._count = 0
+        self._scene_start = 0
+        self._next_novelty = 1
+        self._next_peak = 1
+        # Running novelty statistics (Welford)
+        self._seen = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, frame):
+        """Add the next frame; returns any scenes that are now complete."""
+        self._frames[self._count] = frame
+        self._features[self._count] = frame_feature_row(frame)
+        self._count += 1
+        while self._next_novelty + self.window <= self._count:
+            self._compute_novelty(self._next_novelty)
+        scenes = []
+        while self._next_peak + 1 < self._next_novelty:
+            scene = self._check_boundary(self._next_peak, self._novelty[self._next_peak + 1])
+            if scene:
+                scenes.append(scene)
+        self._prune()
+        return scenes
+
+    def finish(self):
+        """Flush the remaining frames as the final scene(s)."""
+        while self._next_novelty < self._count:
+            self._compute_novelty(self._next_novelty)
+        scenes = []
+        end = self._frames[self._count - 1]['timestamp'] if self._count else 0
+        while self._next_peak < self._count:
+            position = self._next_peak
+            following = self._novelty.get(position + 1, -np.inf)
+            if end - self._frames[position]['timestamp'] < self.min_scene_seconds:
+                self._next_peak = self._count
+                break
+            scene = self._check_boundary(position, following)
+            if scene:
+                scenes.append(scene)
+        if self._scene_start < self._count:
+            scenes.append(self._emit(self._count))
+        return scenes
+
+    def _compute_novelty(self, position):
+        left = np.mean([self._features[i] for i in range(max(0, position - self.window), position)], axis=0)
+        right = np.mean([self._features[i] for i in range(position, min(self._count, position + self.window))],
+                        axis=0)
+        similarity = float((normalize_rows(left[None, :]) * normalize_rows(right[None, :])).sum())
+        value = 1.0 - similarity
+        self._novelty[position] = value
+        self._seen += 1
+        delta = value - self._mean
+        self._mean += delta / self._seen
+        self._m2 += delta * (value - self._mean)
+        self._next_novelty += 1
+
+    def _check_boundary(self, position, following):
+        self._next_peak += 1
+        value = self._novelty[position]
+        threshold = max(self.min_novelty, self._mean + self.std_factor * np.sqrt(self._m2 / self._seen))
+        if not (value >= self._novelty[position - 1] and value > following and value >= threshold):
+            return None
+        start = self._frames[self._scene_start]['timestamp']
+        if self._frames[position]['timestamp'] - start < self.min_scene_seconds:
+            return None
+        return self._emit(position)
+
+    def _emit(self, end):
+        scene = [self._frames.pop(i) for i in range(self._scene_start, end)]
+        self._scene_start = end
+        return scene
+
+    def _prune(self):
+        for index in [i for i in self._features if i < self._next_novelty - self.window]:
+            del self._features[index]
+        for index in [i for i in self._novelty if i < self._next_peak - 1]:
+            del self._novelty[index]
@@ -1,19 +1,112 @@
 from moviepy import VideoFileClip
 import os
 from pathlib import Path
-from PIL import Image
-from openai import OpenAI
 import base64
-from dotenv import load_dotenv
-import tkinter as tk
-from tkinter import filedialog, ttk
 import logging
 from datetime import datetime
 import json
+import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from rate_limiter import RateLimiter
+from api_requests import RequestController, AdaptiveConcurrency, job_resources
+from frame_source import (iter_sampled_frames, iter_parallel_frames, encode_frame, shrink_encoded_frame,
+                          fixed_frame_times, adaptive_frame_times, DEFAULT_CHANGE_THRESHOLD,
+                          DEFAULT_MIN_GAP, DEFAULT_MAX_GAP)
+from frame_features import frame_signature, hamming_distance, signature_to_hex, visual_complexity
+from analysis_checkpoint import AnalysisCheckpoint
+from analysis_store import write_results, RESULTS_FILENAME
+from run_metrics import RunMetrics
+from progress_events import ProgressBus, run_in_background
+from result_cache import make_cache_key, DESCRIPTION_CACHE
+
+VISION_MODEL = "gpt-4-vision-preview"
+FRAME_SYSTEM_PROMPT = """Describe this scene in an engaging, experiential way. 
+Focus on creating atmosphere and emotional connection. Use sensory details and 
+descriptive language that helps viewers feel present in the space. Avoid clinical 
+observations - instead, describe how the space feels and what makes it special.
+Consider:
+- The mood and atmosphere
+- How the space might make someone feel
+- Interesting details that catch the eye
+- The flow and relationship between elements
+- Any unique or distinctive features
+Write as if you're guiding someone through a personal tour."""
+FRAME_USER_PROMPT = "Please provide an engaging, atmospheric description of this scene:"
+BATCH_USER_PROMPT = """You will receive {count} consecutive video frames, each labeled with its timestamp.
+Please provide an engaging, atmospheric description of each frame.
+Reply with only a JSON array of {count} strings, one description per frame, in the same order."""
+
+# Defaults for the concurrent analysis stage
+DEFAULT_MAX_WORKERS = 4
+# Processes decoding frames; 1 decodes in-process
+DEFAULT_DECODE_WORKERS = 1
+DEFAULT_REQUESTS_PER_MINUTE = 100
+DEFAULT_TOKENS_PER_MINUTE = None
+# Max differing dHash bits (of 64) for a frame to reuse the previous description
+DEFAULT_DEDUP_THRESHOLD = 4
+# "fixed" samples once per second, "adaptive" follows visual change
+DEFAULT_SAMPLING = "fixed"
+# In-memory JPEG encoding for the vision request
+DEFAULT_MAX_DIMENSION = 1024
+DEFAULT_JPEG_QUALITY = 85
+DEFAULT_IMAGE_DETAIL = "auto"
+# Rough prompt + image + completion tokens for a single frame request
+FRAME_TOKEN_ESTIMATE = 1500
+LOW_DETAIL_TOKEN_ESTIMATE = 600
+
+# Two-tier analysis: a cheap low-detail pass, escalated to the full pass selectively
+TRIAGE_SYSTEM_PROMPT = """Describe this video frame in one short, plain sentence.
+Then, on a new line, rate how much in it is worth narrating, from 0 (blank wall,
+doorway, blur) to 10 (a distinctive room or feature), as:
+INTEREST: <number>"""
+TRIAGE_USER_PROMPT = "Describe and rate this frame:"
+TRIAGE_MAX_DIMENSION = 512
+TRIAGE_MAX_TOKENS = 60
+TRIAGE_TOKEN_ESTIMATE = 250
+ESCALATION_POLICIES = ("interest", "complexity")
+DEFAULT_ESCALATION_POLICY = "interest"
+# Escalate when the first-pass interest (0-10) or local visual complexity reaches these
+DEFAULT_INTEREST_THRESHOLD = 6
+DEFAULT_COMPLEXITY_THRESHOLD = 0.02
+INTEREST_PATTERN = re.compile(r"INTEREST:\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+def parse_triage(reply):
+    """Split a first-pass reply into (description, interest); interest is None if missing."""
+    match = INTEREST_PATTERN.search(reply or "")
+    if not match:
+        return (reply or "").strip(), None
+    description = (reply[:match.start()] + reply[match.end():]).strip()
+    return description, float(match.group(1))
+
+
+def parse_batch_descriptions(reply, count):
+    """Parse a batched reply into exactly `count` descriptions or raise ValueError."""
+    # Locate the array so a ```json fence or a lead-in sentence is tolerated
+    text = reply or ""
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end == -1:
+        raise ValueError("Batched reply did not contain a JSON array")
+    try:
+        descriptions = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Batched reply was not valid JSON: {e}")
+    if (not isinstance(descriptions, list) or len(descriptions) != count
+            or not all(isinstance(d, str) and d.strip() for d in descriptions)):
+        raise ValueError(f"Expected {count} descriptions in batched reply")
+    return descriptions
 
 class ProgressWindow:
     def __init__(self, title="Processing Video"):
+        # Imported here so headless runs work on Python builds without Tk
+        import tkinter as tk
+        from tkinter import ttk
+
         self.root = tk.Tk()
         self.root.title(title)
         
@@ -49,79 +142,477 @@ class ProgressWindow:
         self.root.destroy()
 
 class EnhancedVideoAnalyzer:
-    def __init__(self, video_path, progress_window=None):
+    def __init__(self, video_path, progress_window=None, max_workers=DEFAULT_MAX_WORKERS,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 dedup_threshold=DEFAULT_DEDUP_THRESHOLD, use_cache=True, cache_dir=None,
+                 max_dimension=DEFAULT_MAX_DIMENSION, jpeg_quality=DEFAULT_JPEG_QUALITY,
+                 detail=DEFAULT_IMAGE_DETAIL, save_frames=False, sampling=DEFAULT_SAMPLING,
+                 resume=False, output_root=None, request_slots=None, batch_size=1, metrics=None,
+                 events=None, decode_workers=DEFAULT_DECODE_WORKERS, on_frame=None,
+                 two_tier=False, escalation_policy=DEFAULT_ESCALATION_POLICY,
+                 escalation_threshold=None, token_budget=None, client=None, rate_limiter=None, cache=None,
+                 change_threshold=DEFAULT_CHANGE_THRESHOLD, min_gap=DEFAULT_MIN_GAP, max_gap=DEFAULT_MAX_GAP):
         """Initialize the enhanced video analyzer."""
-        load_dotenv()
+        # Records are tagged with their analyzer so each run's analysis.log gets only its own
+        self.log = logging.LoggerAdapter(logger, {'analyzer': self})
+        self.client, self.request_slots, self.events, self.cache = job_resources(
+            client, request_slots, events, DESCRIPTION_CACHE if use_cache else None, cache, cache_dir
+        )
         
         self.progress = progress_window
+        self.max_workers = max(1, max_workers)
+        # A long-running worker passes in a limiter shared by all of its jobs
+        self.rate_limiter = rate_limiter or RateLimiter(requests_per_minute, tokens_per_minute)
+        self.dedup_threshold = dedup_threshold
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+        self.detail = detail
+        self.save_frames = save_frames
+        if sampling not in ("fixed", "adaptive"):
+            raise ValueError(f"Unknown sampling mode: {sampling}")
+        self.sampling = sampling
+        # Adaptive sampling: change score that triggers a sample, and the allowed gaps in seconds
+        self.change_threshold = change_threshold
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self.resume = resume
+        self.batch_size = max(1, batch_size)
+        if escalation_policy not in ESCALATION_POLICIES:
+            raise ValueError(f"Unknown escalation policy: {escalation_policy}")
+        self.two_tier = two_tier
+        self.escalation_policy = escalation_policy
+        if escalation_threshold is None:
+            escalation_threshold = (DEFAULT_INTEREST_THRESHOLD if escalation_policy == "interest"
+                                    else DEFAULT_COMPLEXITY_THRESHOLD)
+        self.escalation_threshold = escalation_threshold
+        # Tokens this video may spend before frames stop being escalated
+        self.token_budget = token_budget
+        self.tokens_spent = 0
+        self._spend_lock = threading.Lock()
+        if two_tier and self.batch_size > 1:
+            self.log.warning("Two-tier analysis sends frames one at a time; ignoring batch_size")
+            self.batch_size = 1
+        self.decode_workers = max(1, decode_workers)
+        # Optional callback receiving every frame record in timestamp order
+        self.on_frame = on_frame
+        self.metrics = metrics or RunMetrics()
+        self.requests = RequestController(
+            self.rate_limiter,
+            AdaptiveConcurrency(initial_limit=self.max_workers, max_limit=self.max_workers, log=self.log),
+            metrics=self.metrics,
+            log=self.log
+        )
+        self.token_estimate = LOW_DETAIL_TOKEN_ESTIMATE if detail == "low" else FRAME_TOKEN_ESTIMATE
         self.video_path = video_path
         self.video_name = Path(video_path).stem
-        self.output_dir = Path(f"{self.video_name}_analysis")
+        self.output_dir = Path(output_root or '.') / f"{self.video_name}_analysis"
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        if not os.getenv('OPENAI_API_KEY'):
-            raise ValueError("OpenAI API key not found in environment variables")
-
-        # Configure logging
-        logging.basicConfig(
-            filename=self.output_dir / 'analysis.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
 
-    def update_status(self, message):
-        """Update progress window if available."""
+    def update_status(self, message, **fields):
+        """Publish a progress event; a directly attached window is updated in place."""
+        self.events.publish(message, **fields)
         if self.progress:
             self.progress.update_status(message)
-        logging.info(message)
+        self.log.info(message)
 
-    def analyze_frame(self, frame_path, frame_number, total_frames):
-        """Generate experiential descriptions of frames using GPT-4 Vision."""
-        try:
-            self.update_status(f"Analyzing frame {frame_number} of {total_frames}")
-            
-            with open(frame_path, "rb") as img_file:
-                base64_image = base64.b64encode(img_file.read()).decode('utf-8')
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4-vision-preview",
-                messages=[
-                    {"role": "system", "content": """Describe this scene in an engaging, experiential way. 
-                    Focus on creating atmosphere and emotional connection. Use sensory details and 
-                    descriptive language that helps viewers feel present in the space. Avoid clinical 
-                    observations - instead, describe how the space feels and what makes it special.
-                    Consider:
-                    - The mood and atmosphere
-                    - How the space might make someone feel
-                    - Interesting details that catch the eye
-                    - The flow and relationship between elements
-                    - Any unique or distinctive features
-                    Write as if you're guiding someone through a personal tour."""},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": "Please provide an engaging, atmospheric description of this scene:"},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                }
+    def request_vision(self, messages, max_tokens, token_estimate):
+        """Send one vision request with shared retry, rate and concurrency control."""
+        def send():
+            with self.request_slots:
+                with self.metrics.timer('vision_request'):
+                    return self.client.chat.completions.create(
+                        model=VISION_MODEL,
+                        messages=messages,
+                        max_tokens=max_tokens
+                    )
+
+        response = self.requests.call(send, token_estimate)
+        self.metrics.increment('requests', endpoint='vision')
+        self.metrics.record_usage(response, VISION_MODEL)
+        spent = token_estimate
+        if getattr(response, 'usage', None):
+            spent = response.usage.total_tokens
+            self.rate_limiter.adjust(spent - token_estimate)
+        with self._spend_lock:
+            self.tokens_spent += spent
+        return response
+
+    def describe_frame(self, image_bytes, system_prompt=FRAME_SYSTEM_PROMPT, detail=None,
+                       max_tokens=300, token_estimate=None, instruction=FRAME_USER_PROMPT):
+        """Return a description for one encoded frame, from the cache or the API.
+
+        Defaults to the full atmospheric pass at the configured detail.
+        Raises once retries are exhausted so callers can mark the frame as failed.
+        """
+        detail = detail or self.detail
+        cache_key = None
+        if self.cache:
+            cache_key = self._cache_key(image_bytes, detail, system_prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.metrics.increment('cache_hits')
+                return cached
+            self.metrics.increment('cache_misses')
+        
+        base64_image = base64.b64encode(image_bytes).decode('utf-8')
+        response = self.request_vision(
+            [
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": instruction},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{base64_image}",
+                                "detail": detail
                             }
-                        ],
-                    }
-                ],
-                max_tokens=300
-            )
-            
-            return response.choices[0].message.content
-            
+                        }
+                    ],
+                }
+            ],
+            max_tokens=max_tokens,
+            token_estimate=token_estimate or self.token_estimate
+        )
+        
+        description = response.choices[0].message.content
+        if not description:
+            raise ValueError("Empty description in API response")
+        if self.cache:
+            self.cache.put(cache_key, description)
+        return description
+
+    def describe_frame_tiered(self, image_bytes):
+        """Two-tier description: a cheap low-detail pass, escalated to the full pass if warranted.
+
+        With the "interest" policy every frame gets the first pass and is
+        escalated when its interest rating reaches the threshold (or is
+        missing). With "complexity" the local visual-complexity score of
+        the frame decides before any request is made. Escalation stops once
+        the video's token budget is spent. Returns (description, info) where
+        info records the detail level used and the score behind it.
+        """
+        small_bytes, small_frame = shrink_encoded_frame(image_bytes, TRIAGE_MAX_DIMENSION, self.jpeg_quality)
+        complexity = visual_complexity(small_frame)
+        info = {'complexity': round(complexity, 4)}
+
+        triage = None
+        if self.escalation_policy == "complexity":
+            escalate = complexity >= self.escalation_threshold
+        else:
+            triage = self.triage_frame(small_bytes)
+            info['interest'] = triage[1]
+            escalate = triage[1] is None or triage[1] >= self.escalation_threshold
+
+        if escalate and not self.within_budget():
+            escalate = False
+            self.metrics.increment('escalations_over_budget')
+        if escalate:
+            self.metrics.increment('frames_escalated')
+            info['detail'] = 'high'
+            return self.describe_frame(image_bytes, detail="high",
+                                       token_estimate=FRAME_TOKEN_ESTIMATE), info
+
+        if triage is None:
+            triage = self.triage_frame(small_bytes)
+        self.metrics.increment('frames_low_detail')
+        info['detail'] = 'low'
+        return triage[0] or self.describe_frame(small_bytes, detail="low"), info
+
+    def triage_frame(self, small_bytes):
+        """First-pass (description, interest) from a small low-detail image and short prompt."""
+        reply = self.describe_frame(small_bytes, TRIAGE_SYSTEM_PROMPT, detail="low",
+                                    max_tokens=TRIAGE_MAX_TOKENS, token_estimate=TRIAGE_TOKEN_ESTIMATE,
+                                    instruction=TRIAGE_USER_PROMPT)
+        return parse_triage(reply)
+
+    def within_budget(self):
+        with self._spend_lock:
+            return self.token_budget is None or self.tokens_spent < self.token_budget
+
+    def analyze_frame_batch(self, images, timestamps):
+        """Describe several consecutive frames with one multi-image request.
+
+        Returns one description per image, in order. Raises ValueError when
+        the reply cannot be matched back to the frames so the caller can fall
+        back to single-frame requests.
+        """
+        content = [{"type": "text", "text": BATCH_USER_PROMPT.format(count=len(images))}]
+        for t, image_bytes in zip(timestamps, images):
+            base64_image = base64.b64encode(image_bytes).decode('utf-8')
+            content.append({"type": "text", "text": f"Frame at {t}s:"})
+            content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/jpeg;base64,{base64_image}",
+                    "detail": self.detail
+                }
+            })
+
+        response = self.request_vision(
+            [
+                {"role": "system", "content": FRAME_SYSTEM_PROMPT},
+                {"role": "user", "content": content}
+            ],
+            max_tokens=300 * len(images),
+            token_estimate=self.token_estimate * len(images)
+        )
+        
+        descriptions = parse_batch_descriptions(response.choices[0].message.content, len(images))
+        if self.cache:
+            for image_bytes, description in zip(images, descriptions):
+                self.cache.put(self._cache_key(image_bytes), description)
+        return descriptions
+
+    def _cache_key(self, image_bytes, detail=None, system_prompt=FRAME_SYSTEM_PROMPT):
+        return make_cache_key(image_bytes, VISION_MODEL, detail or self.detail, system_prompt)
+
+    def _analyze_batch(self, batch, total_frames, submitted):
+        """Build result records for a batch of consecutive frames.
+
+        Cached frames are answered locally; the rest go out as one multi-image
+        request, falling back to one request per frame if that fails.
+        """
+        self.metrics.observe('queue_wait', time.perf_counter() - submitted)
+        records = [{'timestamp': item['timestamp'], 'frame_path': item['frame_path'], 'narration': None,
+                    'signature': item['signature']}
+                   for item in batch]
+        if len(batch) == 1:
+            self._analyze_single(records[0], batch[0], total_frames)
+            return records
+
+        uncached = []
+        for record, item in zip(records, batch):
+            if self.cache:
+                record['narration'] = self.cache.get(self._cache_key(item['image_bytes']))
+                self.metrics.increment('cache_hits' if record['narration'] is not None else 'cache_misses')
+            if record['narration'] is None:
+                uncached.append((record, item))
+
+        if len(uncached) > 1:
+            try:
+                descriptions = self.analyze_frame_batch(
+                    [item['image_bytes'] for _, item in uncached],
+                    [item['timestamp'] for _, item in uncached]
+                )
+                for (record, _), description in zip(uncached, descriptions):
+                    record['narration'] = description
+                return records
+            except Exception as e:
+                self.log.warning(f"Batched analysis of {len(uncached)} frames failed, "
+                                f"falling back to single frames: {str(e)}")
+
+        for record, item in uncached:
+            self._analyze_single(record, item, total_frames)
+        return records
+
+    def _analyze_single(self, record, item, total_frames):
+        """Fill in one record, marking it with an error if analysis failed for good."""
+        try:
+            self.log.info(f"Analyzing frame {item['frame_number']} of {total_frames}")
+            if self.two_tier:
+                record['narration'], info = self.describe_frame_tiered(item['image_bytes'])
+                record.update(info)
+            else:
+                record['narration'] = self.describe_frame(item['image_bytes'])
         except Exception as e:
-            logging.error(f"Error analyzing frame {frame_number}: {str(e)}")
-            return f"Error analyzing frame: {str(e)}"
+            self.log.error(f"Error analyzing frame {item['frame_number']}: {str(e)}")
+            record['error'] = str(e)
+            self.metrics.increment('frames_failed')
+
+    def _analyze_frames(self, video, frame_times, checkpoint, finished):
+        """Decode, dedup and batch frames, analyze them on a bounded pool, and checkpoint each result.
+
+        Near-duplicates reuse the last analyzed frame's description, frames in
+        ``finished`` are skipped, and failures are recorded with an ``error``.
+        Records are passed to ``on_frame`` in timestamp order when it is set.
+        """
+        total_frames = len(frame_times)
+        pending = set()
+        batch = []
+        completed = 0
+        reused = 0
+        last_signature = None
+        last_analyzed = None
+        positions = {}
+        held = {}
+        next_position = 1
+        last_source = None
+
+        def release(record):
+            nonlocal next_position, last_source
+            if not self.on_frame:
+                return
+            held[positions.pop(record['timestamp'])] = record
+            while next_position in held:
+                record = held.pop(next_position)
+                next_position += 1
+                if record.get('reused_from') is None:
+                    last_source = record
+                elif last_source is not None and last_source['timestamp'] == record['reused_from']:
+                    record = {**record, 'narration': last_source.get('narration')}
+                    if last_source.get('error'):
+                        record['error'] = last_source['error']
+                self.on_frame(record)
+
+        def collect(done):
+            nonlocal completed
+            for future in done:
+                records = future.result()
+                for record in records:
+                    checkpoint.append(record)
+                    release(record)
+                completed += len(records)
+                self.metrics.increment('frames_analyzed', len(records))
+                self.update_status(f"Analyzed frame {completed} of {total_frames} "
+                                   f"({reused} reused, {len(finished)} resumed)",
+                                   stage='analysis', completed=completed + reused + len(finished),
+                                   total=total_frames)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            decoded = self._timed(self._decoded_frames(video, frame_times), 'decode')
+            for i, (t, frame, signature, image_bytes) in enumerate(decoded, 1):
+                if signature is None:
+                    with self.metrics.timer('signature'):
+                        signature = frame_signature(frame)
+                positions[t] = i
+                previous = finished.get(t)
+                if previous is not None:
+                    # Keep the dedup chain identical to the interrupted run
+                    if previous.get('reused_from') is None:
+                        last_signature = signature
+                        last_analyzed = t
+                    release(previous)
+                    continue
+
+                if (self.dedup_threshold is not None and last_signature is not None
+                        and hamming_distance(signature, last_signature) <= self.dedup_threshold):
+                    record = {
+                        'timestamp': t,
+                        'frame_path': self._save_frame(t, frame, image_bytes),
+                        'narration': None,
+                        'reused_from': last_analyzed,
+                        'signature': signature_to_hex(signature)
+                    }
+                    checkpoint.append(record)
+                    release(record)
+                    reused += 1
+                    self.metrics.increment('frames_reused')
+                    continue
+                last_signature = signature
+                last_analyzed = t
+
+                if image_bytes is None:
+                    image_bytes = self._encode_frame(frame)
+                batch.append({
+                    'timestamp': t,
+                    'image_bytes': image_bytes,
+                    'frame_path': self._save_frame(t, frame, image_bytes),
+                    'frame_number': i,
+                    'signature': signature_to_hex(signature)
+                })
+                if len(batch) < self.batch_size:
+                    continue
+                pending.add(executor.submit(self._analyze_batch, batch, total_frames, time.perf_counter()))
+                batch = []
+                if len(pending) >= 2 * self.max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            if batch:
+                pending.add(executor.submit(self._analyze_batch, batch, total_frames, time.perf_counter()))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        if reused:
+            self.log.info(f"Reused descriptions for {reused} of {total_frames} near-duplicate frames")
+
+    def _decoded_frames(self, video, frame_times):
+        """Yield (timestamp, frame, signature, image_bytes) for the sampled times.
+
+        With one decode worker the open clip is walked in-process and frames
+        are hashed and encoded on demand. With more, time ranges are decoded,
+        hashed and encoded in a process pool and only the results come back.
+        """
+        if self.decode_workers > 1:
+            for t, signature, image_bytes in iter_parallel_frames(
+                    self.video_path, frame_times, self.decode_workers,
+                    self.max_dimension, self.jpeg_quality):
+                yield t, None, signature, image_bytes
+            return
+        for t, frame in iter_sampled_frames(video, frame_times):
+            yield t, frame, None, None
+
+    def _encode_frame(self, frame):
+        """Encode a decoded frame to JPEG bytes for the vision request."""
+        with self.metrics.timer('encode'):
+            return encode_frame(frame, self.max_dimension, self.jpeg_quality)
+
+    def _timed(self, iterable, stage):
+        """Yield from an iterable, recording the time each item takes to produce."""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            item = next(iterator, None)
+            if item is None:
+                return
+            self.metrics.observe(stage, time.perf_counter() - started)
+            yield item
+
+    def _save_frame(self, t, frame, image_bytes=None):
+        """Write the encoded frame to the output directory when enabled."""
+        if not self.save_frames:
+            return None
+        if image_bytes is None:
+            image_bytes = self._encode_frame(frame)
+        frame_path = self.output_dir / f"frame_{t:08.3f}.jpg"
+        frame_path.write_bytes(image_bytes)
+        return str(frame_path)
+
+    def _frame_times(self, duration):
+        """Timestamps to analyze for the configured sampling mode."""
+        if self.sampling == "adaptive":
+            self.update_status("Scanning for visual changes...")
+            frame_times = adaptive_frame_times(self.video_path, change_threshold=self.change_threshold,
+                                               min_gap=self.min_gap, max_gap=self.max_gap)
+            self.log.info(f"Adaptive sampling selected {len(frame_times)} frames "
+                          f"over {duration:.1f}s")
+            return frame_times
+        # 1 frame per second
+        return fixed_frame_times(duration)
+
+    def finalize(self, checkpoint, metadata):
+        """Write the compact narration_results.jsonl from the checkpointed frame results."""
+        frames = checkpoint.frames()
+        failed = sum(1 for frame in frames if frame.get('error'))
+        if failed:
+            self.log.warning(f"{failed} of {len(frames)} frames could not be analyzed; "
+                            f"rerun with resume to retry them")
+        return write_results(self.output_dir / RESULTS_FILENAME, metadata, self.video_name,
+                             frames, datetime.now().isoformat())
+
+    def write_metrics(self):
+        """Export the run's stage timings and token counts as JSON and Prometheus text."""
+        self.metrics.write_json(self.output_dir / 'analysis_metrics.json', video=self.video_name)
+        self.metrics.write_prometheus(self.output_dir / 'analysis_metrics.prom', video=self.video_name)
 
     def process_video(self):
         """Process video frames and generate enhanced descriptions."""
+        # A handler per run: batch and daemon workers analyze many videos per process
+        handler = logging.FileHandler(self.output_dir / 'analysis.log', encoding='utf-8')
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler.addFilter(lambda record: getattr(record, 'analyzer', None) is self)
+        logger.addHandler(handler)
+        try:
+            return self._process_video()
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+    def _process_video(self):
         try:
             self.update_status("Loading video...")
             with VideoFileClip(self.video_path) as video:
@@ -133,51 +624,40 @@ class EnhancedVideoAnalyzer:
                     'filename': self.video_name
                 }
                 
-                # Calculate frame extraction points (1 frame per second)
-                frame_times = range(0, int(video.duration), 1)
-                total_frames = len(frame_times)
+                with self.metrics.timer('sampling'):
+                    frame_times = self._frame_times(video.duration)
                 
-                self.update_status("Extracting and analyzing frames...")
-                frames_data = []
+                checkpoint = AnalysisCheckpoint(self.output_dir / 'narration_checkpoint.jsonl', log=self.log)
+                # Frames that failed last time are analyzed again
+                finished = checkpoint.load() if self.resume else {}
+                finished = {t: r for t, r in finished.items() if not r.get('error')}
+                if finished:
+                    self.update_status(f"Resuming: {len(finished)} frames already analyzed")
                 
-                # Extract and analyze frames
-                for i, t in enumerate(frame_times, 1):
-                    frame = video.get_frame(t)
-                    frame_path = self.output_dir / f"frame_{t:04d}.jpg"
-                    Image.fromarray(frame).save(frame_path)
-                    
-                    # Get enhanced description
-                    description = self.analyze_frame(frame_path, i, total_frames)
-                    
-                    frames_data.append({
-                        'timestamp': t,
-                        'frame_path': str(frame_path),
-                        'narration': description
-                    })
-                    
-                    # Add a small delay to avoid rate limits
-                    time.sleep(0.5)
+                self.update_status("Extracting and analyzing frames...")
+                with checkpoint.open(resume=self.resume):
+                    self._analyze_frames(video, frame_times, checkpoint, finished)
 
             # Save results
             self.update_status("Saving analysis results...")
-            results = {
-                'metadata': metadata,
-                'video_name': self.video_name,
-                'frames': frames_data,
-                'analysis_timestamp': datetime.now().isoformat()
-            }
-            
-            output_path = self.output_dir / 'narration_results.json'
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2)
+            with self.metrics.timer('finalize'):
+                output_path = self.finalize(checkpoint, metadata)
+
+            if self.cache:
+                self.cache.evict()
+                self.log.info(f"Description cache: {self.cache.stats()}")
+
+            self.write_metrics()
 
             return str(output_path)
 
         except Exception as e:
-            logging.error(f"Error processing video: {str(e)}")
+            self.log.error(f"Error processing video: {str(e)}")
             raise
 
 def main():
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
     root = tk.Tk()
     root.withdraw()
 
@@ -192,18 +672,24 @@ def main():
         )
 
         if video_path:
+            events = ProgressBus()
             progress_window = ProgressWindow("Analyzing Video")
-            analyzer = EnhancedVideoAnalyzer(video_path, progress_window)
-            output_path = analyzer.process_video()
+            analyzer = EnhancedVideoAnalyzer(
+                video_path,
+                events=events,
+                decode_workers=max(1, min(4, (os.cpu_count() or 1) // 2))
+            )
+            # Analysis runs on a worker thread so the window stays responsive
+            output_path = run_in_background(progress_window, events, analyzer.process_video)
             progress_window.close()
             
-            tk.messagebox.showinfo(
+            messagebox.showinfo(
                 "Analysis Complete",
                 f"Video analysis completed successfully!\n\nResults saved to:\n{output_path}"
             )
 
     except Exception as e:
-        tk.messagebox.showerror("Error", str(e))
+        messagebox.showerror("Error", str(e))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file